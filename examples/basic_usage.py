@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 import os
 import sys
-import json
 
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from prompt_scanner import PromptScanner
+from prompt_scanner.utils import format_json
 
 def main():
     # Get API key from environment variable
@@ -54,9 +54,9 @@ def main():
         # Check if the only issue is with system message confusion
         system_message_issues = [
             issue for issue in safe_result.issues 
-            if issue.get("type") == "potential_injection" and 
-               issue.get("pattern") == "model_confusion" and
-               issue.get("message_index") == 0 and
+            if issue.type == "potential_injection" and 
+               issue.pattern == "model_confusion" and
+               issue.message_index == 0 and
                safe_prompt["messages"][0]["role"] == "system"
         ]
         
@@ -66,17 +66,17 @@ def main():
             print("System messages commonly use phrases like 'You are a helpful assistant'")
             print("which match injection pattern detection but are legitimate in system role.")
         
-        print(f"Issues: {json.dumps(safe_result.issues, indent=2)}")
+        print(f"Issues: {format_json(safe_result.issues)}")
     
     print("\nUnsafe prompt scan result:")
     print(f"Is safe: {unsafe_result.is_safe}")
     if not unsafe_result.is_safe:
-        print(f"Issues: {json.dumps(unsafe_result.issues, indent=2)}")
+        print(f"Issues: {format_json(unsafe_result.issues)}")
         
     print("\nInvalid prompt scan result:")
     print(f"Is safe: {invalid_result.is_safe}")
     if not invalid_result.is_safe:
-        print(f"Issues: {json.dumps(invalid_result.issues, indent=2)}")
+        print(f"Issues: {format_json(invalid_result.issues)}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
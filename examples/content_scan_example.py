@@ -8,20 +8,24 @@ in prompt inputs using LLM-based evaluation.
 
 import os
 import sys
-import json
-from dotenv import load_dotenv
+import asyncio
 
 # Add parent directory to path so we can import the package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from prompt_scanner.scanner import PromptScanner
-from prompt_scanner.models import PromptScanResult
+# The scanner package (pydantic and the provider SDKs) and dotenv are imported
+# inside the functions that use them, so the mode prompt appears without waiting
+# for them to load.
 
-# Load environment variables from .env file
-load_dotenv()
+def load_env():
+    """Load environment variables from the .env file unless the API keys are already set."""
+    if os.environ.get("OPENAI_API_KEY") is None or os.environ.get("ANTHROPIC_API_KEY") is None:
+        from dotenv import load_dotenv
+        load_dotenv()
 
 def get_api_key(provider):
     """Get API key from environment variables."""
+    load_env()
     if provider.lower() == "openai":
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
@@ -36,8 +40,73 @@ def get_api_key(provider):
         return api_key
     return None
 
+def format_scan_result(result):
+    """Format a scan result as a block of text, so concurrent results print in one piece."""
+    lines = ["Scan Result:", f"Is Safe: {result.is_safe}"]
+    
+    if not result.is_safe:
+        if result.category:
+            lines.append(f"Primary Category: {result.category.name} (ID: {result.category.id})")
+            lines.append(f"Confidence: {result.category.confidence}")
+            
+            # Display severity information
+            if result.severity:
+                lines.append(f"Severity: {result.severity.level.value}")
+                lines.append(f"Severity Score: {result.severity.score:.2f}")
+                if result.severity.description:
+                    lines.append(f"Severity Description: {result.severity.description}")
+        
+        # Display all detected categories if available
+        if result.all_categories and len(result.all_categories) > 1:
+            lines.append("\nAll Detected Categories:")
+            for i, (name, confidence) in enumerate(result.category_confidences()):
+                lines.append(f"  {i+1}. {name} - Confidence: {confidence:.2f}")
+    
+    lines.append(f"Reasoning: {result.reasoning}")
+    return "\n".join(lines)
+
+async def read_lines():
+    """Yield lines typed on stdin without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:  # EOF
+            return
+        yield line.rstrip("\n")
+
+async def scan_user_input_async(scanner, max_concurrent_requests=5):
+    """Scan each entered line in its own task, printing results as they arrive."""
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    tasks = set()
+    
+    async def handle(number, text):
+        async with semaphore:
+            result = await scanner.scan_text_async(text)
+        # Number the output so interleaved results stay attributable to their input
+        print(f"\n[#{number}] {text}\n{format_scan_result(result)}")
+    
+    number = 0
+    async for user_input in read_lines():
+        if user_input.lower() in ['exit', 'quit']:
+            break
+        if not user_input.strip():
+            continue
+        
+        number += 1
+        print(f"[#{number}] scanning...")
+        task = asyncio.create_task(handle(number, user_input))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    # Let scans that are still running finish before exiting
+    if tasks:
+        await asyncio.gather(*tasks)
+
 def scan_user_input(provider="openai", model=None):
     """Interactive mode to scan user input"""
+    from prompt_scanner.scanner import PromptScanner
+    
+    load_env()
     scanner = PromptScanner(provider=provider, model=model)
     
     print(f"\nInitialized PromptScanner with {provider} provider")
@@ -46,41 +115,19 @@ def scan_user_input(provider="openai", model=None):
     else:
         print("Using default model")
     
-    print("Enter text to scan (or 'exit' to quit):")
+    print("Enter text to scan, one prompt per line (or 'exit' to quit).")
+    print("You can keep typing while earlier prompts are being scanned.")
     
-    while True:
-        user_input = input("\n> ")
-        if user_input.lower() in ['exit', 'quit']:
-            break
-            
-        result = scanner.scan_text(user_input)
-        
-        print("\nScan Result:")
-        print(f"Is Safe: {result.is_safe}")
-        
-        if not result.is_safe:
-            if result.category:
-                print(f"Primary Category: {result.category.name} (ID: {result.category.id})")
-                print(f"Confidence: {result.category.confidence}")
-                
-                # Display severity information
-                if result.severity:
-                    print(f"Severity: {result.severity.level.value}")
-                    print(f"Severity Score: {result.severity.score:.2f}")
-                    if result.severity.description:
-                        print(f"Severity Description: {result.severity.description}")
-            
-            # Display all detected categories if available
-            if result.all_categories and len(result.all_categories) > 1:
-                print("\nAll Detected Categories:")
-                for i, cat in enumerate(result.all_categories):
-                    print(f"  {i+1}. {cat.get('name')} - Confidence: {cat.get('confidence', 0):.2f}")
-        
-        print(f"Reasoning: {result.reasoning}")
+    asyncio.run(scan_user_input_async(scanner))
     
     print("\nThank you for using the Prompt Scanner!")
 
 def main():
+    from prompt_scanner.scanner import PromptScanner
+    from prompt_scanner.utils import format_json
+    
+    load_env()
+    
     # Initialize the scanner with your preferred provider and model
     # If not specified, defaults to OpenAI with gpt-4o model
     # It will use environment variables for API keys
@@ -107,36 +154,17 @@ def main():
     
     # Test each prompt with the custom scanner
     scanner = custom_scanner  # Use the custom scanner for demonstration
-    for i, prompt in enumerate(test_prompts):
+    
+    # Scan all prompts concurrently instead of one round-trip at a time
+    results = asyncio.run(scanner.scan_texts_async(test_prompts, max_concurrency=5))
+    
+    for i, (prompt, result) in enumerate(zip(test_prompts, results)):
         print(f"\n{'='*50}")
         print(f"Testing prompt {i+1}: {prompt}")
         
-        # Scan the content
-        result = scanner.scan_text(prompt)
-        
         # Display results
-        print("\nScan Result:")
-        print(f"Is Safe: {result.is_safe}")
-        
-        if not result.is_safe:
-            if result.category:
-                print(f"Primary Category: {result.category.name} (ID: {result.category.id})")
-                print(f"Confidence: {result.category.confidence}")
-                
-                # Display severity information
-                if result.severity:
-                    print(f"Severity: {result.severity.level.value}")
-                    print(f"Severity Score: {result.severity.score:.2f}")
-                    if result.severity.description:
-                        print(f"Severity Description: {result.severity.description}")
-            
-            # Display all detected categories if available
-            if result.all_categories and len(result.all_categories) > 1:
-                print("\nAll Detected Categories:")
-                for i, cat in enumerate(result.all_categories):
-                    print(f"  {i+1}. {cat.get('name')} - Confidence: {cat.get('confidence', 0):.2f}")
-        
-        print(f"Reasoning: {result.reasoning}")
+        print()
+        print(format_scan_result(result))
         
         if hasattr(result, 'token_usage') and result.token_usage:
             print("\nToken Usage:")
@@ -158,7 +186,7 @@ def main():
     print(f"Is Safe: {openai_result.is_safe}")
     if not openai_result.is_safe:
         print("Issues:")
-        print(json.dumps(openai_result.issues, indent=2))
+        print(format_json(openai_result.issues))
 
 if __name__ == "__main__":
     print("Prompt Scanner Example - LLM-based Content Safety")
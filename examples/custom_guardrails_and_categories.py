@@ -1,12 +1,11 @@
 import os
 import sys
-from typing import Dict, Any, List
 
 # Add parent directory to path so we can import prompt_scanner
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from prompt_scanner import PromptScanner
-from prompt_scanner.models import CustomGuardrail, CustomCategory, SeverityLevel, CategorySeverity
+from prompt_scanner.models import CustomGuardrail, CustomCategory
 
 # Initialize the prompt scanner with OpenAI (default)
 scanner = PromptScanner(api_key=os.environ.get("OPENAI_API_KEY"))
@@ -79,10 +78,10 @@ for i, prompt in enumerate(test_prompts):
     if not result.is_safe:
         print("Issues detected:")
         for issue in result.issues:
-            print(f"  - Type: {issue['type']}")
-            print(f"    Description: {issue['description']}")
-            print(f"    Severity: {issue.get('severity', 'unknown')}")
-            if issue.get('custom', False):
+            print(f"  - Type: {issue.type}")
+            print(f"    Description: {issue.description}")
+            print(f"    Severity: {issue.severity}")
+            if issue.custom:
                 print(f"    Custom rule: Yes")
             print()
 
@@ -98,7 +97,7 @@ product_info_guardrail = CustomGuardrail(
         {
             "type": "regex",
             "value": r"upcoming\s+product\s+release",
-            "description": "Upcoming product release info" 
+            "description": "Upcoming product release info"
         },
         {
             "type": "regex",
@@ -139,10 +138,10 @@ print(f"Is safe: {result.is_safe}")
 if not result.is_safe:
     print("Issues detected:")
     for issue in result.issues:
-        print(f"  - Type: {issue['type']}")
-        print(f"    Description: {issue['description']}")
-        print(f"    Severity: {issue.get('severity', 'unknown')}")
-        print(f"    Custom rule: {issue.get('custom', False)}")
+        print(f"  - Type: {issue.type}")
+        print(f"    Description: {issue.description}")
+        print(f"    Severity: {issue.severity}")
+        print(f"    Custom rule: {issue.custom}")
         print()
 
 # Remove a custom guardrail
@@ -165,9 +164,11 @@ test_texts = [
     "How to create illegal content that harms children"  # Unsafe - critical severity
 ]
 
-for i, text in enumerate(test_texts):
+# Scan all texts with one LLM call instead of one call per text
+results = scanner.scan_text_batch(test_texts)
+
+for i, (text, result) in enumerate(zip(test_texts, results)):
     print(f"\n--- Testing Text {i+1} ---")
-    result = scanner.scan_text(text)
     print(f"Content: '{text}'")
     print(f"Is safe: {result.is_safe}")
     
@@ -183,11 +184,17 @@ for i, text in enumerate(test_texts):
         
         print(f"Reasoning: {result.reasoning}")
 
+# Triage the batch: most severe first, skipping anything below HIGH
+from prompt_scanner import rank_by_severity
+print("\n--- Results at HIGH severity or above ---")
+for result in rank_by_severity(results, min_level="HIGH"):
+    print(f"{result.severity.level.value} ({result.severity.score:.2f}): {result.category.name if result.category else 'Unknown'}")
+
 # Example 5: Manually setting severity levels
 print("\n=== Manually Setting Severity Levels ===")
 
 # Create a manual scan result with custom severity
-from prompt_scanner.models import PromptScanResult, PromptCategory
+from prompt_scanner.models import PromptScanResult, PromptCategory, CategorySeverity, SeverityLevel
 
 # Create category
 category = PromptCategory(
@@ -220,24 +227,15 @@ print(f"Severity Score: {result.severity.score:.2f}")
 print(f"Severity Description: {result.severity.description}")
 print(f"Result as string: {str(result)}")
 print(f"Result as dictionary: {result.to_dict()}")
+print(f"Result as JSON: {result.to_json()}")
 
 # Example of severity level comparison
 print("\n=== Severity Level Comparison ===")
-# Create a helper function for severity comparison
-def compare_severity(level1, level2):
-    severity_order = {
-        SeverityLevel.LOW: 0,
-        SeverityLevel.MEDIUM: 1,
-        SeverityLevel.HIGH: 2,
-        SeverityLevel.CRITICAL: 3
-    }
-    return severity_order[level1] < severity_order[level2]
-
-# Use the helper function to compare severity levels
-print(f"LOW < MEDIUM: {compare_severity(SeverityLevel.LOW, SeverityLevel.MEDIUM)}")
-print(f"MEDIUM < HIGH: {compare_severity(SeverityLevel.MEDIUM, SeverityLevel.HIGH)}")
-print(f"HIGH < CRITICAL: {compare_severity(SeverityLevel.HIGH, SeverityLevel.CRITICAL)}")
-print(f"CRITICAL < LOW: {compare_severity(SeverityLevel.CRITICAL, SeverityLevel.LOW)}")
+# Severity levels compare by severity, not alphabetically
+print(f"LOW < MEDIUM: {SeverityLevel.LOW < SeverityLevel.MEDIUM}")
+print(f"MEDIUM < HIGH: {SeverityLevel.MEDIUM < SeverityLevel.HIGH}")
+print(f"HIGH < CRITICAL: {SeverityLevel.HIGH < SeverityLevel.CRITICAL}")
+print(f"CRITICAL < LOW: {SeverityLevel.CRITICAL < SeverityLevel.LOW}")
 
 # Direct string comparison (alphabetical) - NOT RELIABLE for severity comparison
 print(f"\nString value comparison (unreliable for severity):")
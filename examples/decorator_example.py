@@ -8,15 +8,15 @@ to scan inputs and outputs for unsafe content.
 
 import os
 import sys
-import json
 from typing import Dict, Any, Union
 from dotenv import load_dotenv
 
 # Add parent directory to path so we can import the package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from prompt_scanner import PromptScanner, PromptScanResult, ScanResult
+from prompt_scanner import PromptScanner, PromptScanResult, ScanResult, ResultCache
 from prompt_scanner.models import SeverityLevel, CategorySeverity
+from prompt_scanner.utils import format_json
 from openai import OpenAI
 
 # Load environment variables from .env file
@@ -26,7 +26,9 @@ load_dotenv()
 client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
 # Initialize the PromptScanner - only need one instance
-scanner = PromptScanner(provider="openai")
+# The result cache makes repeated scans of the same text, e.g. a decorated function
+# called again with the same prompt, return without another LLM call
+scanner = PromptScanner(provider="openai", result_cache=ResultCache(maxsize=1024))
 
 # Type hint for function return values
 ContentResult = Union[str, Dict[str, Any], PromptScanResult, ScanResult]
@@ -73,6 +75,10 @@ def answer_question(question: str) -> ContentResult:
     return response.choices[0].message.content
 
 # Example 3: Working with structured data
+def build_search_term(query_data: Dict[str, Any]) -> str:
+    """Join the query terms and filter values into one search string."""
+    return " ".join([str(query_data.get("terms", "")), *(str(v) for v in query_data.get("filters", {}).values())])
+
 @scanner.decorators.scan(prompt_param="query_data")
 def search_database(query_data: Dict[str, Any]) -> Union[Dict[str, Any], PromptScanResult]:
     """
@@ -81,7 +87,7 @@ def search_database(query_data: Dict[str, Any]) -> Union[Dict[str, Any], PromptS
     Demonstrates that the scanner can handle complex objects as input.
     """
     # Format the search terms from the query object into a clean string
-    search_term = f"{query_data.get('terms', '')} {' '.join(str(v) for v in query_data.get('filters', {}).values())}"
+    search_term = build_search_term(query_data)
     print(f"\nSearching database with terms: '{search_term}'")
     
     # Simple simulation of database search
@@ -100,65 +106,78 @@ def search_database(query_data: Dict[str, Any]) -> Union[Dict[str, Any], PromptS
     return results
 
 # Helper function to handle scan results consistently
+# Emoji shown next to each severity level
+SEVERITY_EMOJI = {
+    SeverityLevel.LOW: "🔵",       # Blue circle for low
+    SeverityLevel.MEDIUM: "🟡",    # Yellow circle for medium
+    SeverityLevel.HIGH: "🔴",      # Red circle for high
+    SeverityLevel.CRITICAL: "⛔",  # No entry for critical
+}
+
+def _print_unsafe(result: PromptScanResult) -> None:
+    """Print a PromptScanResult, which the decorators return for unsafe content."""
+    print("\n🚫 UNSAFE CONTENT DETECTED")
+    print(f"Category: {result.category.name if result.category else 'Unknown'}")
+    print(f"Confidence: {result.category.confidence:.2f}" if result.category else "Confidence: N/A")
+    
+    # Display severity information
+    severity = result.severity
+    if severity:
+        emoji = SEVERITY_EMOJI.get(severity.level, "⚠️")
+        print(f"Severity: {emoji} {severity.level.value} (score: {severity.score:.2f})")
+        if severity.description:
+            print(f"Severity Description: {severity.description}")
+    
+    print(f"Reasoning: {result.reasoning}")
+    
+    # Check if there are multiple violations
+    if result.all_categories and len(result.all_categories) > 1:
+        print("\nAdditional violations:")
+        for cat in result.all_categories[1:3]:  # Show up to 2 additional violations
+            print(f"- {cat.get('name')}: {cat.get('confidence', 0):.2f}")
+
+def _print_scan_result(result: ScanResult) -> None:
+    """Print a ScanResult from scanning a prompt object."""
+    print("\n🔍 SCAN RESULT")
+    print(f"Is Safe: {result.is_safe}")
+    if result.issues:
+        print("Issues detected:")
+        for issue in result.issues:
+            print(f"- {issue.get('description', 'Unknown issue')}")
+            if 'severity' in issue:
+                print(f"  Severity: {issue['severity']}")
+            if 'type' in issue:
+                print(f"  Type: {issue['type']}")
+    else:
+        print("No issues detected")
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to limit characters, marking the cut with an ellipsis."""
+    return f"{text[:limit]}..." if len(text) > limit else text
+
+def _print_dict(result: Dict[str, Any]) -> None:
+    """Print a safe dictionary result, truncated to 200 characters."""
+    # Serialize once; the same string is measured and printed
+    print(f"\n✅ SAFE RESULT: {_truncate(format_json(result), 200)}")
+
+def _print_other(result: Any) -> None:
+    """Print a string or any other safe result, truncated to 100 characters."""
+    try:
+        print(f"\n✅ SAFE RESULT: {_truncate(str(result), 100)}")
+    except Exception:
+        # Fallback for any other type
+        print(f"\n✅ RESULT: {result}")
+
+# Printer for each result type the decorated functions return
+RESULT_PRINTERS = {
+    PromptScanResult: _print_unsafe,
+    ScanResult: _print_scan_result,
+    dict: _print_dict,
+}
+
 def handle_scan_result(result) -> None:
     """Helper function to print appropriate information based on result type."""
-    if isinstance(result, PromptScanResult):
-        # This is how you identify a PromptScanResult (unsafe content)
-        print("\n🚫 UNSAFE CONTENT DETECTED")
-        print(f"Category: {result.category.name if result.category else 'Unknown'}")
-        print(f"Confidence: {result.category.confidence:.2f}" if result.category else "Confidence: N/A")
-        
-        # Display severity information
-        if result.severity:
-            # Use emoji indicators based on severity level
-            severity_emoji = "⚠️"  # Default - warning
-            if result.severity.level.value == "LOW":
-                severity_emoji = "🔵"  # Blue circle for low
-            elif result.severity.level.value == "MEDIUM":
-                severity_emoji = "🟡"  # Yellow circle for medium
-            elif result.severity.level.value == "HIGH":
-                severity_emoji = "🔴"  # Red circle for high
-            elif result.severity.level.value == "CRITICAL":
-                severity_emoji = "⛔"  # No entry for critical
-                
-            print(f"Severity: {severity_emoji} {result.severity.level.value} (score: {result.severity.score:.2f})")
-            if result.severity.description:
-                print(f"Severity Description: {result.severity.description}")
-        
-        print(f"Reasoning: {result.reasoning}")
-        
-        # Check if there are multiple violations
-        if hasattr(result, 'all_categories') and result.all_categories and len(result.all_categories) > 1:
-            print("\nAdditional violations:")
-            for cat in result.all_categories[1:3]:  # Show up to 2 additional violations
-                print(f"- {cat.get('name')}: {cat.get('confidence', 0):.2f}")
-    elif isinstance(result, ScanResult):
-        # Handle ScanResult objects
-        print("\n🔍 SCAN RESULT")
-        print(f"Is Safe: {result.is_safe}")
-        if result.issues:
-            print("Issues detected:")
-            for issue in result.issues:
-                print(f"- {issue.get('description', 'Unknown issue')}")
-                if 'severity' in issue:
-                    print(f"  Severity: {issue['severity']}")
-                if 'type' in issue:
-                    print(f"  Type: {issue['type']}")
-        else:
-            print("No issues detected")
-    elif isinstance(result, dict):
-        # Handle dictionary results
-        print(f"\n✅ SAFE RESULT: {json.dumps(result, indent=2)[:200]}..." 
-                if len(json.dumps(result)) > 200 else f"\n✅ SAFE RESULT: {json.dumps(result, indent=2)}")
-    else:
-        # Handle string or other types
-        try:
-            # Try to get the length and slice it
-            result_str = str(result)
-            print(f"\n✅ SAFE RESULT: {result_str[:100]}..." if len(result_str) > 100 else f"\n✅ SAFE RESULT: {result_str}")
-        except Exception:
-            # Fallback for any other type
-            print(f"\n✅ RESULT: {result}")
+    RESULT_PRINTERS.get(type(result), _print_other)(result)
 
 def main():
     print("🔍 Prompt Scanner Decorator Example")
@@ -203,10 +222,10 @@ def main():
         "terms": "quantum computing applications",
         "filters": {"category": "science", "max_results": 5}
     }
-    print(f"Testing with safe structured query: {json.dumps(safe_query, indent=2)}")
+    print(f"Testing with safe structured query: {format_json(safe_query)}")
     
     # First perform a content safety check on the query terms
-    query_terms = safe_query["terms"] + " " + " ".join(str(v) for v in safe_query["filters"].values())
+    query_terms = build_search_term(safe_query)
     safety_result = scanner.scan_text(query_terms)
     
     if isinstance(safety_result, PromptScanResult) and not safety_result.is_safe:
@@ -222,10 +241,10 @@ def main():
         "terms": "how to create ransomware for extortion",
         "filters": {"category": "security", "max_results": 5}
     }
-    print(f"\nTesting with unsafe structured query: {json.dumps(unsafe_query, indent=2)}")
+    print(f"\nTesting with unsafe structured query: {format_json(unsafe_query)}")
     
     # First perform a content safety check on the query terms
-    query_terms = unsafe_query["terms"] + " " + " ".join(str(v) for v in unsafe_query["filters"].values())
+    query_terms = build_search_term(unsafe_query)
     safety_result = scanner.scan_text(query_terms)
     
     if isinstance(safety_result, PromptScanResult) and not safety_result.is_safe:
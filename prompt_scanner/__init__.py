@@ -1,12 +1,9 @@
-from prompt_scanner.scanner import PromptScanner, ScanResult, BasePromptScanner, OpenAIPromptScanner, AnthropicPromptScanner
-from prompt_scanner.models import PromptScanResult, PromptCategory, CategorySeverity, CustomGuardrail, CustomCategory
-import prompt_scanner.decorators as decorators
-
 __version__ = "0.3.1"
 __all__ = [
     # Main scanner classes
     "PromptScanner", 
     "ScanResult", 
+    "Issue",
     "BasePromptScanner",
     "OpenAIPromptScanner",
     "AnthropicPromptScanner",
@@ -15,11 +12,55 @@ __all__ = [
     "PromptScanResult", 
     "PromptCategory",
     "CategorySeverity",
+    "SeverityLevel",
+    "filter_by_min_severity",
+    "rank_by_severity",
     
     # Custom guardrail models
     "CustomGuardrail",
     "CustomCategory",
     
+    # Caching
+    "SemanticCache",
+    "ResultCache",
+    "PersistentResultCache",
+    
     # Module imports
     "decorators"
-] 
\ No newline at end of file
+]
+
+# Module defining each public name. The scanner module imports the OpenAI and Anthropic
+# SDKs and the models import pydantic, which take most of the package's import time, so
+# a module is only imported once one of its names is used. This keeps commands such as
+# `prompt-scanner --version` fast. The decorators module (which imports asyncio) is
+# loaded the same way.
+_LAZY_NAMES = {
+    **dict.fromkeys(
+        ["PromptScanner", "ScanResult", "BasePromptScanner", "OpenAIPromptScanner", "AnthropicPromptScanner"],
+        "prompt_scanner.scanner"
+    ),
+    **dict.fromkeys(
+        ["PromptScanResult", "PromptCategory", "CategorySeverity", "CustomGuardrail", "CustomCategory",
+         "Issue", "SeverityLevel", "filter_by_min_severity", "rank_by_severity"],
+        "prompt_scanner.models"
+    ),
+    "SemanticCache": "prompt_scanner.semantic_cache",
+    "ResultCache": "prompt_scanner.result_cache",
+    "PersistentResultCache": "prompt_scanner.persistent_cache",
+}
+
+
+def __getattr__(name):
+    if name == "decorators":
+        import prompt_scanner.decorators as decorators
+        return decorators
+    if name in _LAZY_NAMES:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES) | {"decorators"})
@@ -4,12 +4,65 @@ import json
 import sys
 import os
 import logging
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
-from prompt_scanner import PromptScanner, PromptScanResult, __version__
+from prompt_scanner import __version__
+from prompt_scanner.utils import format_json, parse_json
 
+if TYPE_CHECKING:
+    from prompt_scanner.models import PromptScanResult
 
-def parse_args() -> argparse.Namespace:
+# Default for --max-input-chars, the longest --file or --stdin input accepted. Anything
+# longer would exceed the context window of the supported models, so it is rejected
+# without reading it all into memory.
+MAX_INPUT_CHARS = 1_000_000
+
+# Buffer size for --file and --guardrails input. Large files are read in a few
+# 128 KiB chunks instead of many of the default 8 KiB.
+INPUT_BUFFER_SIZE = 1 << 17
+
+# ANSI escape codes used in text output, and their blank counterparts for --no-color
+COLORS = {
+    "GREEN": "\033[92m",
+    "RED": "\033[91m",
+    "YELLOW": "\033[93m",
+    "BOLD": "\033[1m",
+    "RESET": "\033[0m",
+}
+NO_COLORS = {name: "" for name in COLORS}
+# Color of each severity level in text output; other levels are shown in green
+SEVERITY_COLORS = {"MEDIUM": "YELLOW", "HIGH": "RED", "CRITICAL": "RED"}
+
+
+def _fixed_lines(colors: dict) -> dict:
+    """Render the lines of text output that don't depend on the result."""
+    return {
+        "safe": f"{colors['GREEN']}✅ Content is safe{colors['RESET']}",
+        "reasoning": f"\n{colors['BOLD']}Reasoning:{colors['RESET']}",
+        "token_usage": f"\n{colors['BOLD']}Token usage:{colors['RESET']}",
+    }
+
+
+# Fixed lines rendered once for each color setting instead of on every call
+COLOR_LINES = _fixed_lines(COLORS)
+NO_COLOR_LINES = _fixed_lines(NO_COLORS)
+
+
+def _positive_int(value: str) -> int:
+    """Parse a command-line value that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; parsing doesn't modify it, so it is reused."""
     parser = argparse.ArgumentParser(
         description="""
 Prompt Scanner CLI - Scan prompts for potentially unsafe content.
@@ -78,7 +131,7 @@ API KEY SETUP:
         "--color",
         action="store_true",
         default=True,
-        help="Use color in output (default: True)"
+        help="Use color in output when writing to a terminal (default: True)"
     )
     output_group.add_argument(
         "--no-color",
@@ -102,6 +155,12 @@ API KEY SETUP:
         action="store_true",
         help="Read content from standard input"
     )
+    parser.add_argument(
+        "--max-input-chars",
+        type=_positive_int,
+        default=MAX_INPUT_CHARS,
+        help=f"Longest --file or --stdin input accepted, in characters (default: {MAX_INPUT_CHARS})"
+    )
     
     # Custom guardrails
     guardrail_group = parser.add_argument_group('Custom Guardrails')
@@ -110,14 +169,37 @@ API KEY SETUP:
         help="Path to a JSON file containing custom guardrails"
     )
     
-    return parser.parse_args()
+    return parser
+
+
+def __getattr__(name: str):
+    # PromptScanner imports the provider SDKs, so it is only loaded once a scan runs;
+    # --help, --version and usage errors exit without paying for that import
+    if name == "PromptScanner":
+        from prompt_scanner import PromptScanner
+        globals()[name] = PromptScanner
+        return PromptScanner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _scanner_class():
+    """Return PromptScanner, importing it on first use."""
+    return globals().get("PromptScanner") or __getattr__("PromptScanner")
+
+
+def parse_args() -> argparse.Namespace:
+    args = _build_parser().parse_args()
+    # Escape codes would only clutter output that is piped or redirected
+    args.color = args.color and sys.stdout.isatty()
+    return args
 
 
 def load_guardrails(guardrail_file: str) -> Dict[str, Any]:
     """Load custom guardrails from a JSON file."""
     try:
-        with open(guardrail_file, 'r') as f:
-            guardrails = json.load(f)
+        # Read bytes in large chunks and let the parser decode them
+        with open(guardrail_file, 'rb', buffering=INPUT_BUFFER_SIZE) as f:
+            guardrails = parse_json(f.read())
             if not isinstance(guardrails, dict):
                 logging.getLogger(__name__).error(f"Guardrails file should contain a JSON object")
                 sys.exit(1)
@@ -130,6 +212,17 @@ def load_guardrails(guardrail_file: str) -> Dict[str, Any]:
         sys.exit(1)
 
 
+def _read_limited(stream, source: str, max_chars: int = MAX_INPUT_CHARS) -> str:
+    """Read at most max_chars characters from stream, exiting if there is more."""
+    content = stream.read(max_chars + 1)
+    if len(content) > max_chars:
+        logging.getLogger(__name__).error(
+            f"Input from {source} is longer than {max_chars} characters; raise the limit with --max-input-chars"
+        )
+        sys.exit(1)
+    return content
+
+
 def get_input_text(args: argparse.Namespace) -> str:
     """Get the input text from the specified source."""
     logger = logging.getLogger(__name__)
@@ -140,8 +233,8 @@ def get_input_text(args: argparse.Namespace) -> str:
     elif args.file:
         try:
             logger.info(f"Input: Reading from file '{args.file}'")
-            with open(args.file, 'r') as f:
-                content = f.read()
+            with open(args.file, 'r', buffering=INPUT_BUFFER_SIZE) as f:
+                content = _read_limited(f, "file", args.max_input_chars)
                 logger.info(f"Read {len(content)} characters from file")
                 return content
         except Exception as e:
@@ -149,112 +242,115 @@ def get_input_text(args: argparse.Namespace) -> str:
             sys.exit(1)
     elif args.stdin:
         logger.info(f"Input: Reading from standard input")
-        content = sys.stdin.read()
+        content = _read_limited(sys.stdin, "stdin", args.max_input_chars)
         logger.info(f"Read {len(content)} characters from stdin")
         return content
     
     return ""  # This should never happen due to the mutually exclusive group
 
 
-def format_result(result: PromptScanResult, format_type: str, verbose: int, use_color: bool) -> str:
+def format_result(result: "PromptScanResult", format_type: str, verbose: int, use_color: bool) -> str:
     """Format the scan result based on the specified format type."""
+    # Read the severity once; both formats use its level, score and description
+    severity = result.severity
+    severity_level = severity.name if severity else None
+    
     # For JSON format
     if format_type == "json":
         result_dict = {
             "is_safe": result.is_safe,
             "category": result.category.name if result.category else None,
-            "severity": result.severity.level.value if result.severity else None,
+            "severity": severity_level,
             "reasoning": result.reasoning  # Always include reasoning
         }
         
         if verbose >= 2:
             result_dict["token_usage"] = result.token_usage
-            if result.severity:
+            if severity:
                 result_dict["severity_details"] = {
-                    "level": result.severity.level.value,
-                    "score": result.severity.score,
-                    "description": result.severity.description
+                    "level": severity_level,
+                    "score": severity.score,
+                    "description": severity.description
                 }
         
-        return json.dumps(result_dict, indent=2)
+        return format_json(result_dict)
     else:  # text format
         output = []
         
         # Use colors if enabled
-        if use_color:
-            GREEN = "\033[92m"
-            RED = "\033[91m"
-            YELLOW = "\033[93m"
-            BOLD = "\033[1m"
-            RESET = "\033[0m"
-        else:
-            GREEN = RED = YELLOW = BOLD = RESET = ""
+        colors, lines = (COLORS, COLOR_LINES) if use_color else (NO_COLORS, NO_COLOR_LINES)
+        RED, BOLD, RESET = colors["RED"], colors["BOLD"], colors["RESET"]
         
         if result.is_safe:
-            output.append(f"{GREEN}✅ Content is safe{RESET}")
+            output.append(lines["safe"])
         else:
             output.append(f"{RED}❌ Content violates: {BOLD}{result.category.name}{RESET}")
             
             # Add severity information
-            if result.severity:
-                severity_level = result.severity.level.value
+            if severity:
                 # Choose color based on severity level
-                severity_color = GREEN
-                if severity_level == "MEDIUM":
-                    severity_color = YELLOW
-                elif severity_level in ("HIGH", "CRITICAL"):
-                    severity_color = RED
+                severity_color = colors[SEVERITY_COLORS.get(severity_level, "GREEN")]
                 
                 output.append(f"Severity: {severity_color}{severity_level}{RESET}")
                 
                 # Add severity description for verbose output
-                if verbose >= 1 and result.severity.description:
-                    output.append(f"Description: {result.severity.description}")
+                if verbose >= 1 and severity.description:
+                    output.append(f"Description: {severity.description}")
         
         # Always include reasoning
-        output.append(f"\n{BOLD}Reasoning:{RESET}")
+        output.append(lines["reasoning"])
         output.append(result.reasoning)
         
         if verbose >= 2:
-            output.append(f"\n{BOLD}Token usage:{RESET}")
-            output.append(json.dumps(result.token_usage, indent=2))
+            output.append(lines["token_usage"])
+            output.append(format_json(result.token_usage))
         
         return "\n".join(output)
 
 
-def setup_api_keys(args: argparse.Namespace) -> None:
-    """Set up API keys from args or check if they're in environment."""
+def setup_api_keys(args: argparse.Namespace) -> Optional[str]:
+    """
+    Resolve the API key for the selected provider from args or the environment.
+    
+    Keys given on the command line take precedence and are passed straight to the
+    scanner instead of being written to os.environ.
+    """
     logger = logging.getLogger(__name__)
 
-    # Set API keys from command line if provided
     if args.openai_api_key:
-        os.environ["OPENAI_API_KEY"] = args.openai_api_key
         logger.info("Using OpenAI API key from command line")
     
     if args.anthropic_api_key:
-        os.environ["ANTHROPIC_API_KEY"] = args.anthropic_api_key
         logger.info("Using Anthropic API key from command line")
     
-    # Check if required API key is in environment
+    # Check that the selected provider has a key
     provider = args.provider.lower()
-    if provider == "openai" and "OPENAI_API_KEY" not in os.environ:
-        logger.error("OpenAI API key not found. Set OPENAI_API_KEY environment variable or use --openai-api-key")
-        sys.exit(1)
-    elif provider == "anthropic" and "ANTHROPIC_API_KEY" not in os.environ:
-        logger.error("Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable or use --anthropic-api-key")
-        sys.exit(1)
+    if provider == "openai":
+        api_key = args.openai_api_key or os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            logger.error("OpenAI API key not found. Set OPENAI_API_KEY environment variable or use --openai-api-key")
+            sys.exit(1)
+        return api_key
+    elif provider == "anthropic":
+        api_key = args.anthropic_api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            logger.error("Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable or use --anthropic-api-key")
+            sys.exit(1)
+        return api_key
+    return None
 
 
 def main():
-    # Load environment variables from .env file if it exists
+    args = parse_args()
+    
+    # Load environment variables from .env file if it exists. This happens after
+    # parsing so that --help, --version and usage errors don't wait for it.
     try:
         from dotenv import load_dotenv
         load_dotenv()
     except ImportError:
         # dotenv is optional, proceed without it if not installed
-        pass 
-        
-    args = parse_args()
+        pass
 
     # Configure logging
     log_level = logging.ERROR
@@ -265,7 +361,7 @@ def main():
     logger = logging.getLogger(__name__) # Get logger instance
 
     # Pass args directly instead of verbose level
-    setup_api_keys(args) 
+    api_key = setup_api_keys(args)
     content = get_input_text(args) 
 
     # Determine model based on provider if not specified
@@ -290,7 +386,7 @@ def main():
             logger.info(f"Adding custom guardrail: {name}")
 
     try:
-        scanner = PromptScanner(provider=args.provider, model=model)
+        scanner = _scanner_class()(provider=args.provider, model=model, api_key=api_key)
         for name, definition in custom_guardrails.items():
             scanner.add_guardrail(name, definition)
         
@@ -1,5 +1,43 @@
+import asyncio
 import functools
-from typing import Callable
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+def _prompt_getter(func: Callable, prompt_param: str) -> Callable[[Tuple, Dict[str, Any]], Any]:
+    """
+    Return a function that extracts the prompt_param argument from a call to func.
+    
+    The parameter's position is looked up with inspect.signature on the first call
+    made with positional arguments and then reused, so decorated functions called in
+    loops don't inspect their signature every time.
+    """
+    position: Optional[int] = None
+    resolved = False
+    
+    def get_prompt(args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        nonlocal position, resolved
+        # Check kwargs first
+        if prompt_param in kwargs:
+            return kwargs[prompt_param]
+        # Then check args based on function signature
+        if not args:
+            return None
+        if not resolved:
+            param_names = list(inspect.signature(func).parameters.keys())
+            if prompt_param in param_names:
+                position = param_names.index(prompt_param)
+            resolved = True
+        if position is not None and position < len(args):
+            return args[position]
+        return None
+    
+    return get_prompt
+
+def _needs_scan(content) -> bool:
+    """Whether content is worth scanning; empty values and blank strings are skipped."""
+    if isinstance(content, str):
+        return bool(content) and not content.isspace()
+    return bool(content)
 
 def scan(
     scanner=None,
@@ -17,37 +55,21 @@ def scan(
         Decorator function
     """
     def decorator(func: Callable):
+        get_prompt = _prompt_getter(func, prompt_param)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Use the scanner provided to the decorator or from class
-            nonlocal scanner
             if scanner is None:
                 raise ValueError("No scanner instance provided to the decorator")
             
             # Extract prompt from args or kwargs based on prompt_param
-            prompt = None
-            
-            # Check kwargs first
-            if prompt_param in kwargs:
-                prompt = kwargs[prompt_param]
-            # Then check args based on function signature
-            elif args:
-                import inspect
-                sig = inspect.signature(func)
-                param_names = list(sig.parameters.keys())
-                if prompt_param in param_names:
-                    idx = param_names.index(prompt_param)
-                    if idx < len(args):
-                        prompt = args[idx]
-            
-            if not prompt:
+            prompt = get_prompt(args, kwargs)
+            
+            if not _needs_scan(prompt):
                 return func(*args, **kwargs)
             
             # Scan prompt - use scan_text for strings, scan for dictionaries/objects
-            if isinstance(prompt, str):
-                scan_result = scanner.scan_text(prompt)
-            else:
-                scan_result = scanner.scan(prompt)
+            scan_result = _scan(scanner, prompt)
             
             # Return the scan result if unsafe, otherwise call the function
             if not scan_result.is_safe:
@@ -58,70 +80,144 @@ def scan(
         return wrapper
     return decorator
 
+def _scan(scanner, content):
+    """Scan text with scan_text, and dictionaries/objects with scan."""
+    if isinstance(content, str):
+        return scanner.scan_text(content)
+    return scanner.scan(content)
+
 def safe_completion(
     scanner=None, 
-    prompt_param: str = "prompt"
+    prompt_param: str = "prompt",
+    scan_together: bool = False
 ):
     """
     Decorator that ensures completions are safe by scanning both input and output.
     If input is unsafe, returns the scan result. If output is unsafe, returns the scan result.
     
+    By default the input is scanned before the decorated function is called. With
+    scan_together, a text prompt is instead scanned after the call, in the same LLM
+    request as a text response, which saves one round-trip per call. Only use it for
+    functions that may safely run before the input has been checked.
+    
     Args:
         scanner: The PromptScanner instance to use
         prompt_param: The parameter name that contains the prompt text
+        scan_together: Whether to scan a text prompt together with the response
         
     Returns:
         Decorator function
     """
     def decorator(func: Callable):
+        get_prompt = _prompt_getter(func, prompt_param)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Use the scanner provided to the decorator or from class
-            nonlocal scanner
             if scanner is None:
-                raise ValueError("No scanner instance provided to the decorator") 
+                raise ValueError("No scanner instance provided to the decorator")
             
             # Extract prompt from args or kwargs based on prompt_param
-            prompt = None
-            
-            # Check kwargs first
-            if prompt_param in kwargs:
-                prompt = kwargs[prompt_param]
-            # Then check args based on function signature
-            elif args:
-                import inspect
-                sig = inspect.signature(func)
-                param_names = list(sig.parameters.keys())
-                if prompt_param in param_names:
-                    idx = param_names.index(prompt_param)
-                    if idx < len(args):
-                        prompt = args[idx]
+            prompt = get_prompt(args, kwargs)
+            check_input = _needs_scan(prompt)
+            defer_input = check_input and scan_together and isinstance(prompt, str)
             
             # Check input prompt if available
-            if prompt:
-                # Use scan_text for strings, scan for dictionaries/objects
-                if isinstance(prompt, str):
-                    input_result = scanner.scan_text(prompt)
-                else:
-                    input_result = scanner.scan(prompt)
-                    
+            if check_input and not defer_input:
+                input_result = _scan(scanner, prompt)
                 if not input_result.is_safe:
                     return input_result
             
             # Call the original function
             response = func(*args, **kwargs)
+            check_output = _needs_scan(response)
             
-            # Check output content safety
-            if response:
-                # Use scan_text for strings, scan for dictionaries/objects
-                if isinstance(response, str):
-                    output_result = scanner.scan_text(response)
+            if defer_input:
+                if check_output and isinstance(response, str):
+                    results = scanner.scan_text_batch([prompt, response])
                 else:
-                    output_result = scanner.scan(response)
-                    
+                    results = [scanner.scan_text(prompt)]
+                    if check_output:
+                        results.append(_scan(scanner, response))
+                
+                # The input verdict takes precedence over the output verdict
+                for result in results:
+                    if not result.is_safe:
+                        return result
+                return response
+            
+            # Check output content safety
+            if check_output:
+                output_result = _scan(scanner, response)
+                if not output_result.is_safe:
+                    return output_result
+            
+            return response
+        return wrapper
+    return decorator
+
+async def _scan_async(scanner, content):
+    """Scan text with scan_text_async, and dictionaries/objects with scan in a worker thread."""
+    if isinstance(content, str):
+        return await scanner.scan_text_async(content)
+    # scan() is synchronous; running it on the loop would stop the completion from progressing
+    return await asyncio.get_running_loop().run_in_executor(None, scanner.scan, content)
+
+async def _cancel(task: asyncio.Future) -> None:
+    """Cancel task and wait for it to finish, so it isn't left pending with an unretrieved exception."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+def async_safe_completion(
+    scanner=None,
+    prompt_param: str = "prompt"
+):
+    """
+    Async version of safe_completion for coroutine functions.
+    
+    The input scan and the decorated coroutine run concurrently, so the completion
+    request doesn't wait for the input verdict. If the input turns out to be unsafe,
+    the coroutine is cancelled and the scan result is returned. Only use it for
+    functions that may safely start before the input has been checked, e.g. ones
+    that just request a completion.
+    
+    Args:
+        scanner: The PromptScanner instance to use
+        prompt_param: The parameter name that contains the prompt text
+        
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable):
+        get_prompt = _prompt_getter(func, prompt_param)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if scanner is None:
+                raise ValueError("No scanner instance provided to the decorator")
+            
+            prompt = get_prompt(args, kwargs)
+            
+            # Start the completion while the input is being scanned
+            completion = asyncio.ensure_future(func(*args, **kwargs))
+            
+            if _needs_scan(prompt):
+                try:
+                    input_result = await _scan_async(scanner, prompt)
+                except BaseException:
+                    await _cancel(completion)
+                    raise
+                if not input_result.is_safe:
+                    await _cancel(completion)
+                    return input_result
+            
+            response = await completion
+            
+            # Check output content safety
+            if _needs_scan(response):
+                output_result = await _scan_async(scanner, response)
                 if not output_result.is_safe:
                     return output_result
             
             return response
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
@@ -1,13 +1,81 @@
-from typing import List, Dict, Any, Union, Optional, Literal
+import heapq
+from typing import List, Dict, Any, Union, Optional, Literal, Tuple
 from pydantic import BaseModel, Field, model_validator
 from enum import Enum, auto
 
+from prompt_scanner.utils import format_json
+
 class SeverityLevel(str, Enum):
-    """Enum for severity levels of safety categories"""
+    """
+    Enum for severity levels of safety categories.
+    
+    Values stay upper-case strings for JSON output, but levels compare by severity
+    (LOW < MEDIUM < HIGH < CRITICAL) rather than alphabetically, including against
+    level names such as "high".
+    """
     LOW = "LOW"
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
     CRITICAL = "CRITICAL"
+    
+    @classmethod
+    def _missing_(cls, value):
+        """Accept lower-case levels such as the "high" used in issue severities"""
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+    
+    @property
+    def rank(self) -> int:
+        """Integer position of the level, from 0 (LOW) to 3 (CRITICAL)"""
+        return _SEVERITY_RANKS[self]
+    
+    def __lt__(self, other):
+        other_rank = _severity_rank_of(other)
+        if other_rank is None:
+            return NotImplemented
+        return _SEVERITY_RANKS[self] < other_rank
+    
+    def __le__(self, other):
+        other_rank = _severity_rank_of(other)
+        if other_rank is None:
+            return NotImplemented
+        return _SEVERITY_RANKS[self] <= other_rank
+    
+    def __gt__(self, other):
+        other_rank = _severity_rank_of(other)
+        if other_rank is None:
+            return NotImplemented
+        return _SEVERITY_RANKS[self] > other_rank
+    
+    def __ge__(self, other):
+        other_rank = _severity_rank_of(other)
+        if other_rank is None:
+            return NotImplemented
+        return _SEVERITY_RANKS[self] >= other_rank
+
+# Rank of each severity level, computed once instead of on every comparison
+_SEVERITY_RANKS = {level: rank for rank, level in enumerate(SeverityLevel)}
+# String value of each level; a dict lookup is several times faster than Enum.value
+_SEVERITY_VALUES = {level: level.value for level in SeverityLevel}
+# Issues use lower-case severities; SeverityLevel members hash like their upper-case values
+_ISSUE_SEVERITY_RANKS = {
+    **{level.value: rank for level, rank in _SEVERITY_RANKS.items()},
+    **{level.value.lower(): rank for level, rank in _SEVERITY_RANKS.items()}
+}
+
+
+def _severity_rank_of(value) -> Optional[int]:
+    """Rank of a SeverityLevel or a level name such as "high", or None if value isn't a level"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return _SEVERITY_RANKS[SeverityLevel(value)]
+    except ValueError:
+        return None
+
+# Message roles accepted in OpenAI prompts, built once rather than per validation
+_OPENAI_VALID_ROLES = frozenset({"system", "user", "assistant", "tool", "function"})
 
 class Message(BaseModel):
     role: str
@@ -24,9 +92,8 @@ class OpenAIPrompt(BaseModel):
             raise ValueError("At least one message is required")
         
         # Validate roles for OpenAI (system, user, assistant, tool, function)
-        valid_roles = {"system", "user", "assistant", "tool", "function"}
         for i, msg in enumerate(self.messages):
-            if msg.role not in valid_roles:
+            if msg.role not in _OPENAI_VALID_ROLES:
                 raise ValueError(f"Message at index {i} has invalid role: {msg.role}")
         return self
 
@@ -55,6 +122,85 @@ class OldAnthropicPrompt(BaseModel):
 # Union type for all supported prompt formats
 PromptType = Union[OpenAIPrompt, AnthropicPrompt, OldAnthropicPrompt] 
 
+def _issue_entry(key: str, default: Any = None) -> property:
+    """Expose an issue dictionary entry as a read-only attribute."""
+    return property(lambda self: self.get(key, default), doc=f"The issue's '{key}' entry")
+
+class Issue(dict):
+    """
+    A single issue found while scanning a prompt.
+    
+    Issues stay plain dictionaries, so issue["type"], issue.get(...) and json.dumps
+    keep working, but their common entries can also be read as attributes.
+    """
+    __slots__ = ()
+    
+    type = _issue_entry("type")
+    description = _issue_entry("description")
+    severity = _issue_entry("severity", "unknown")
+    message_index = _issue_entry("message_index")
+    pattern = _issue_entry("pattern")
+    guardrail = _issue_entry("guardrail")
+    field = _issue_entry("field")
+    category = _issue_entry("category")
+    custom = _issue_entry("custom", False)
+    
+    def _asdict(self) -> Dict[str, Any]:
+        """Return the issue as a plain dictionary"""
+        return dict(self)
+
+def filter_by_min_severity(issues: List[Dict[str, Any]], min_level: Union[SeverityLevel, str]) -> List[Dict[str, Any]]:
+    """
+    Return the issues whose severity is at least min_level.
+    
+    Issues without a recognised severity (e.g. "unknown") are left out.
+    
+    Args:
+        issues: Issues as found in ScanResult.issues
+        min_level: Lowest severity to keep, as a SeverityLevel or level name
+        
+    Returns:
+        The matching issues, in their original order
+    """
+    threshold = _SEVERITY_RANKS[SeverityLevel(min_level)]
+    return [
+        issue for issue in issues
+        if _ISSUE_SEVERITY_RANKS.get(issue.get("severity"), -1) >= threshold
+    ]
+
+def _severity_key(result: "PromptScanResult") -> int:
+    """Pack a result's severity rank and score into one integer, or -1 without a severity"""
+    severity = result.severity
+    if severity is None:
+        return -1
+    return (_SEVERITY_RANKS[severity.level] << 8) | int(severity.score * 255)
+
+def rank_by_severity(
+    results: List["PromptScanResult"],
+    min_level: Optional[Union[SeverityLevel, str]] = None
+) -> List["PromptScanResult"]:
+    """
+    Return the results ordered from most to least severe.
+    
+    Each result's severity level and score are packed into a single integer key
+    up front, so large batches are thresholded and sorted by comparing plain ints
+    rather than reading the severity models on every comparison.
+    
+    Args:
+        results: Scan results, e.g. from scan_text_batch
+        min_level: If given, leave out results below this level and results without a severity
+        
+    Returns:
+        The results by descending level, then score; ties keep their original order
+    """
+    keys = [_severity_key(result) for result in results]
+    indices = range(len(results))
+    if min_level is not None:
+        threshold = _SEVERITY_RANKS[SeverityLevel(min_level)] << 8
+        indices = [i for i in indices if keys[i] >= threshold]
+    order = sorted(indices, key=keys.__getitem__, reverse=True)
+    return [results[i] for i in order]
+
 # Prompt Scanning Result Model
 class PromptCategory(BaseModel):
     id: str
@@ -75,7 +221,11 @@ class CategorySeverity(BaseModel):
     @property
     def name(self) -> str:
         """Return the name of the severity level for compatibility"""
-        return self.level.value
+        return _SEVERITY_VALUES[self.level]
+
+def _category_confidence(category: Dict[str, Any]) -> float:
+    """Sort key ranking category dictionaries by confidence"""
+    return category.get("confidence", 0)
 
 class PromptScanResult(BaseModel):
     is_safe: bool = True
@@ -101,12 +251,11 @@ class PromptScanResult(BaseModel):
         """String representation of scan result for quick viewing"""
         if self.is_safe:
             return f"SAFE | Token usage: {self.token_usage}"
-        else:
-            category_info = f"Category: {self.category.name}"
-            severity_info = f" | Severity: {self.severity.level.value}" if self.severity else ""
-            if self.all_categories and len(self.all_categories) > 1:
-                category_info += f" and {len(self.all_categories)-1} more"
-            return f"UNSAFE | {category_info}{severity_info} | Reasoning: {self.reasoning} | Token usage: {self.token_usage}"
+        extra_count = len(self.all_categories) - 1
+        extra_info = f" and {extra_count} more" if extra_count > 0 else ""
+        severity_info = f" | Severity: {_SEVERITY_VALUES[self.severity.level]}" if self.severity else ""
+        return (f"UNSAFE | Category: {self.category.name}{extra_info}{severity_info}"
+                f" | Reasoning: {self.reasoning} | Token usage: {self.token_usage}")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the scan result to a dictionary for easier API consumption"""
@@ -117,18 +266,20 @@ class PromptScanResult(BaseModel):
             "metadata": self.metadata
         }
         
-        if not self.is_safe and self.category:
+        category = self.category
+        if not self.is_safe and category:
             result["primary_category"] = {
-                "id": self.category.id,
-                "name": self.category.name,
-                "confidence": self.category.confidence
+                "id": category.id,
+                "name": category.name,
+                "confidence": category.confidence
             }
             
-            if self.severity:
+            severity = self.severity
+            if severity:
                 result["severity"] = {
-                    "level": self.severity.level.value,
-                    "score": self.severity.score,
-                    "description": self.severity.description
+                    "level": _SEVERITY_VALUES[severity.level],
+                    "score": severity.score,
+                    "description": severity.description
                 }
             
             if self.all_categories:
@@ -136,12 +287,13 @@ class PromptScanResult(BaseModel):
         
         return result
     
+    def to_json(self, indent: bool = False) -> str:
+        """Serialize to_dict() straight to JSON, using orjson when it is installed"""
+        return format_json(self.to_dict(), indent=indent)
+    
     def get_secondary_categories(self) -> List[Dict[str, Any]]:
         """Return all categories except the primary one"""
-        if not self.all_categories or len(self.all_categories) <= 1:
-            return []
-        
-        # Skip the first category (primary) and return the rest
+        # Skip the first category (primary); the slice is empty for zero or one category
         return self.all_categories[1:]
     
     def has_high_confidence_violation(self, threshold: float = 0.8) -> bool:
@@ -155,12 +307,22 @@ class PromptScanResult(BaseModel):
         if not self.all_categories:
             return []
         
-        # Return sorted categories by confidence, limited by max_count
-        return sorted(
-            self.all_categories, 
-            key=lambda x: x.get("confidence", 0), 
-            reverse=True
-        )[:max_count]
+        # Select the top max_count without sorting every category; ties keep their order
+        return heapq.nlargest(max_count, self.all_categories, key=_category_confidence)
+    
+    def category_confidences(self) -> List[Tuple[str, float]]:
+        """Return (name, confidence) pairs for all detected categories, in ranking order"""
+        return [
+            (category.get("name", "Unknown"), category.get("confidence", 0))
+            for category in self.all_categories
+        ]
+    
+    def categories_above(self, min_confidence: float) -> List[Dict[str, Any]]:
+        """Return the detected categories with confidence of at least min_confidence, in ranking order"""
+        return [
+            category for category in self.all_categories
+            if _category_confidence(category) >= min_confidence
+        ]
 
 class CustomGuardrail(BaseModel):
     """Model representing a custom user-defined guardrail"""
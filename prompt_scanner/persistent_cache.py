@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from prompt_scanner.models import PromptScanResult
+from prompt_scanner.result_cache import ResultCache
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "prompt-scanner", "results.db")
+
+
+class PersistentResultCache(ResultCache):
+    """
+    ResultCache backed by a SQLite database, so results survive across processes.
+
+    Lookups check the in-memory LRU first and fall back to the database; results
+    found on disk are promoted to memory. Keys include the scanner's policy
+    fingerprint, so processes with different custom categories can share a file.
+    Short-lived processes such as CI jobs or repeated script runs then reuse
+    verdicts from earlier runs instead of calling the LLM again. Entries older than
+    ttl seconds are ignored, whether held in memory or on disk, and purged from the
+    database when the cache is opened.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = None, maxsize: int = 1024):
+        """
+        Initialize the PersistentResultCache.
+
+        Args:
+            path: SQLite database file, created along with its directory if missing
+            ttl: Maximum age of a cached result in seconds, or None to keep results forever
+            maxsize: Maximum number of results kept in the in-memory LRU
+        """
+        super().__init__(maxsize=maxsize)
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._db_lock, self._conn:
+            # WAL lets concurrent processes read while another one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key BLOB PRIMARY KEY, model TEXT, payload TEXT, created REAL)"
+            )
+            if ttl is not None:
+                self._conn.execute("DELETE FROM results WHERE created < ?", (time.time() - ttl,))
+
+    def get(self, text: str, model: str, policy: str = "") -> Optional[PromptScanResult]:
+        """
+        Return a copy of the cached result for text scanned with model, or None on a miss.
+
+        Args:
+            text: The text about to be scanned
+            model: Name of the model evaluating the text
+            policy: Fingerprint of the content policies the text is evaluated against
+        """
+        result = super().get(text, model, policy)
+        if result is not None:
+            return result
+
+        key = self._key(text, model, policy)
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT payload, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or self._expired(row[1]):
+            return None
+
+        result = PromptScanResult.model_validate_json(row[0])
+        # Keep the stored creation time so the entry expires from memory on schedule
+        self._store(key, result.model_copy(deep=True), row[1])
+        # The in-memory lookup above counted a miss, but the result was found
+        with self._lock:
+            self.misses -= 1
+            self.hits += 1
+        return result
+
+    def put(self, text: str, model: str, result: PromptScanResult, policy: str = "") -> None:
+        """
+        Store the scan result for text scanned with model in memory and on disk.
+
+        Args:
+            text: The scanned text
+            model: Name of the model that evaluated the text
+            result: The result returned by the LLM evaluation
+            policy: Fingerprint of the content policies the text was evaluated against
+        """
+        super().put(text, model, result, policy)
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, model, payload, created) VALUES (?, ?, ?, ?)",
+                (self._key(text, model, policy), model, result.model_dump_json(), time.time())
+            )
+
+    def _expired(self, created: float) -> bool:
+        """Return True if an entry created at the given time is older than ttl."""
+        return self.ttl is not None and created < time.time() - self.ttl
+
+    def clear(self) -> None:
+        """Remove all cached results from memory and from the database."""
+        super().clear()
+        with self._db_lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._db_lock:
+            self._conn.close()
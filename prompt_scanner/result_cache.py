@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from prompt_scanner.models import PromptScanResult
+
+
+class ResultCache:
+    """
+    Least-recently-used cache of text scan results, keyed by a hash of the text and policies.
+
+    Scanning the same text twice with the same model then costs a dictionary lookup
+    instead of an LLM call. Scanners pass a fingerprint of their content policies, so
+    a verdict made under one policy set is never reused under another. Runs of
+    whitespace are collapsed before hashing, so texts that differ only in spacing or
+    line breaks share an entry. Reusing a verdict is only sound when the evaluation
+    is deterministic for a given input, which is why the cache is opt-in. The cache
+    is safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the ResultCache.
+
+        Args:
+            maxsize: Maximum number of results kept before the least recently used is evicted
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        # Each result is stored with the time it was created, so subclasses can expire it
+        self._results: "OrderedDict[bytes, Tuple[float, PromptScanResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _key(text: str, model: str, policy: str = "") -> bytes:
+        """
+        Hash the policy and whitespace-normalized text to a fixed-size key, so long
+        texts aren't kept in memory.
+        """
+        normalized = " ".join(text.split())
+        hasher = hashlib.blake2b(digest_size=16)
+        if policy:
+            hasher.update(policy.encode("utf-8") + b"\0")
+        hasher.update(normalized.encode("utf-8", "surrogatepass"))
+        return hasher.digest() + model.encode("utf-8")
+
+    def get(self, text: str, model: str, policy: str = "") -> Optional[PromptScanResult]:
+        """
+        Return a copy of the cached result for text scanned with model, or None on a miss.
+
+        Args:
+            text: The text about to be scanned
+            model: Name of the model evaluating the text
+            policy: Fingerprint of the content policies the text is evaluated against
+        """
+        key = self._key(text, model, policy)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._results[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._results.move_to_end(key)
+        return entry[1].model_copy(deep=True)
+
+    def put(self, text: str, model: str, result: PromptScanResult, policy: str = "") -> None:
+        """
+        Store the scan result for text scanned with model.
+
+        Args:
+            text: The scanned text
+            model: Name of the model that evaluated the text
+            result: The result returned by the LLM evaluation
+            policy: Fingerprint of the content policies the text was evaluated against
+        """
+        self._store(self._key(text, model, policy), result.model_copy(deep=True), time.time())
+
+    def _store(self, key: bytes, result: PromptScanResult, created: float) -> None:
+        """Keep result in memory under key, evicting the least recently used entry when full."""
+        with self._lock:
+            self._results[key] = (created, result)
+            self._results.move_to_end(key)
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def _expired(self, created: float) -> bool:
+        """Return True if an entry created at the given time must no longer be served."""
+        return False
+
+    def clear(self) -> None:
+        """Remove all cached results. The hit and miss counters are kept."""
+        self.clear_memory()
+
+    def clear_memory(self) -> None:
+        """
+        Remove the results held in memory. The hit and miss counters are kept.
+
+        For this cache that is every result; subclasses backed by storage keep theirs.
+        """
+        with self._lock:
+            self._results.clear()
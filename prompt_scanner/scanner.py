@@ -1,19 +1,359 @@
 import os
+import copy
 import yaml
 import re
 import json
+import string
+import asyncio
+import functools
+import hashlib
+import importlib
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional, Literal, Union, cast, Protocol, Type, TypeVar
+from typing import Dict, Iterator, List, Any, Optional, Literal, Union, cast, Protocol, Type, TypeVar
 from abc import ABC, abstractmethod
 from pydantic import ValidationError
-from dotenv import load_dotenv
-from openai import OpenAI
-from anthropic import Anthropic
 
-from prompt_scanner.models import OpenAIPrompt, AnthropicPrompt, OldAnthropicPrompt, PromptType, PromptScanResult, PromptCategory, CategorySeverity, SeverityLevel
+from prompt_scanner.models import OpenAIPrompt, AnthropicPrompt, OldAnthropicPrompt, PromptType, PromptScanResult, PromptCategory, CategorySeverity, SeverityLevel, Issue, _category_confidence
+from prompt_scanner.semantic_cache import SemanticCache
+from prompt_scanner.result_cache import ResultCache
+from prompt_scanner.utils import parse_json
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+try:
+    import re2
+except ImportError:  # RE2 is optional; custom guardrails then use the re module
+    re2 = None
+
+# Package providing each SDK client class. The OpenAI and Anthropic SDKs take most of
+# this module's import time, so a provider's SDK is only imported when a scanner for it
+# creates a client. The classes can still be read as attributes of this module.
+_SDK_CLASSES = {
+    "OpenAI": "openai",
+    "AsyncOpenAI": "openai",
+    "Anthropic": "anthropic",
+    "AsyncAnthropic": "anthropic",
+}
+
+
+def __getattr__(name):
+    if name in _SDK_CLASSES:
+        return getattr(importlib.import_module(_SDK_CLASSES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _sdk_class(name: str):
+    """Return the named SDK client class, preferring one assigned to this module, e.g. by mock.patch."""
+    return globals().get(name) or __getattr__(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_dotenv() -> None:
+    """Load environment variables from a .env file, once per process."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+# Bounded, as guardrails added and removed at runtime bring new regexes and alternations
+@functools.lru_cache(maxsize=1024)
+def _required_literals(regex: str) -> Optional[List[str]]:
+    """
+    Extract lowercase literals of which at least one must appear in any match of regex.
+    
+    Returns None when no such literals can be determined, in which case the regex
+    must always be run. Results are memoized, so scanners created after the first
+    don't parse the same patterns again; the returned list is shared and must not
+    be changed.
+    """
+    try:
+        parsed = sre_parse.parse(regex)
+    except (re.error, OverflowError, RecursionError):
+        return None
+    
+    literals = _literals_from_items(list(parsed))
+    if not literals or not all(literal.isascii() for literal in literals):
+        # Non-ASCII literals don't lowercase the same way re.IGNORECASE folds them
+        return None
+    return [literal.lower() for literal in literals]
+
+
+def _literals_from_items(items) -> Optional[List[str]]:
+    """Pick the most selective set of required literals from a parsed regex sequence."""
+    best = None
+    run = []
+    
+    def better(current, candidate):
+        if not candidate:
+            return current
+        if current is None or min(map(len, candidate)) > min(map(len, current)):
+            return candidate
+        return current
+    
+    for op, av in items + [(None, None)]:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            best = better(best, ["".join(run)])
+            run = []
+        if op is sre_constants.BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                branch_literals = _literals_from_items(list(branch))
+                if not branch_literals:
+                    alternatives = None
+                    break
+                alternatives.extend(branch_literals)
+            best = better(best, alternatives)
+        elif op is sre_constants.SUBPATTERN:
+            best = better(best, _literals_from_items(list(av[-1])))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            best = better(best, _literals_from_items(list(av[2])))
+    
+    return best
+
+
+# Parsed regex operators that change meaning, or stop working, inside a combined alternation
+_UNCOMBINABLE_OPCODES = frozenset({
+    sre_constants.GROUPREF,
+    sre_constants.GROUPREF_EXISTS,
+    sre_constants.GROUPREF_IGNORE,
+    sre_constants.ASSERT,
+    sre_constants.ASSERT_NOT,
+})
+# Possessive repeats and atomic groups only exist from Python 3.11
+_REPEAT_OPCODES = tuple(
+    op for op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None))
+    if op is not None
+)
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_combinable(regex: str) -> bool:
+    """
+    Return True if regex can be merged with others into one alternation.
+    
+    Backreferences, lookarounds, named groups and global inline flags are kept out:
+    their group numbers, names or flags would clash with the other alternatives.
+    The verdict is memoized so known-incompatible regexes are only analyzed once.
+    """
+    try:
+        parsed = sre_parse.parse(regex)
+    except (re.error, OverflowError, RecursionError):
+        return False
+    
+    if parsed.state.groupdict or parsed.state.flags & ~sre_constants.SRE_FLAG_UNICODE:
+        return False
+    
+    stack = [list(parsed)]
+    while stack:
+        for op, av in stack.pop():
+            if op in _UNCOMBINABLE_OPCODES:
+                return False
+            if op is sre_constants.BRANCH:
+                stack.extend(list(branch) for branch in av[1])
+            elif op is sre_constants.SUBPATTERN:
+                stack.append(list(av[-1]))
+            elif op in _REPEAT_OPCODES:
+                stack.append(list(av[2]))
+            elif op is _ATOMIC_GROUP:
+                stack.append(list(av))
+    return True
+
+
+# Lowercase substrings that send a short text to the LLM when the pre-filter is enabled
+RISK_KEYWORDS = (
+    "hack", "exploit", "malware", "virus", "ransomware", "phish", "scam", "fraud",
+    "steal", "theft", "rob", "counterfeit", "launder", "illegal", "drug",
+    "bomb", "explosive", "weapon", "gun", "kill", "murder", "attack", "poison",
+    "hurt", "harm", "violen", "abuse", "suicide", "terror",
+    "hate", "racis", "slur", "porn", "sex", "nude",
+    "password", "credit card", "social security", "ssn", "address", "phone number",
+    "track", "stalk", "surveil", "dox",
+    "invest", "stock", "crypto", "loan", "tax", "lawsuit", "legal", "lawyer", "sue",
+    "medic", "diagnos", "symptom", "dose", "prescri",
+    "vote", "elect", "campaign", "politic", "government", "lobby",
+)
+_RISK_KEYWORDS_REGEX = re.compile("|".join(map(re.escape, RISK_KEYWORDS)))
+
+# Prompt messages shorter than this made only of ASCII digits and whitespace, such as
+# "42", are checked against the injection patterns and guardrails but not sent to the
+# LLM. Punctuation can carry path traversal or encoded payloads such as "../" or "%00",
+# so it still goes to the LLM, as does any text passed to scan_text directly.
+MIN_LLM_SCAN_LENGTH = 8
+_NUMERIC_CHARS = frozenset(string.digits + string.whitespace)
+
+
+def _needs_llm_evaluation(content: Any) -> bool:
+    """Return False for a prompt message too short and numeric for the LLM to judge."""
+    return not (
+        isinstance(content, str) and len(content) < MIN_LLM_SCAN_LENGTH and _NUMERIC_CHARS.issuperset(content)
+    )
+
+
+def _literals_absent(pattern: Dict[str, Any], content_lower: Optional[str]) -> bool:
+    """Return True if the pattern's required literals rule out a match in the lowered content."""
+    hints = pattern.get("literal_hints")
+    if not hints or content_lower is None:
+        return False
+    return not any(hint in content_lower for hint in hints)
+
+
+def _lower_for_prefilter(content: str) -> Optional[str]:
+    """Lowercase content for literal prefiltering, or None if it can't be prefiltered safely."""
+    if isinstance(content, str) and content.isascii():
+        return content.lower()
+    return None
+
+
+def _message_texts(content: Union[str, List[Dict[str, Any]]]) -> Iterator[str]:
+    """Yield the text of a validated message's content, skipping non-text parts."""
+    if isinstance(content, str):
+        yield content
+        return
+    # Message models have already checked that every part is a dict
+    for part in content:
+        if part.get("type") == "text":
+            yield part.get("text", "")
+
+
+def _split_token_usage(token_usage: Dict[str, int], count: int) -> List[Dict[str, int]]:
+    """
+    Split the token usage of one call into count shares that add up to it exactly.
+    
+    Each count is divided with divmod and the first shares get one extra token of the
+    remainder. A total_tokens equal to prompt_tokens plus completion_tokens is
+    recomputed for each share, so every share stays consistent with itself.
+    """
+    shares: List[Dict[str, int]] = [{} for _ in range(count)]
+    derived_total = (
+        "prompt_tokens" in token_usage and "completion_tokens" in token_usage
+        and token_usage.get("total_tokens") == token_usage["prompt_tokens"] + token_usage["completion_tokens"]
+    )
+    for key, value in token_usage.items():
+        if derived_total and key == "total_tokens":
+            continue
+        quotient, remainder = divmod(value, count)
+        for n, share in enumerate(shares):
+            share[key] = quotient + (n < remainder)
+    if derived_total:
+        for share in shares:
+            share["total_tokens"] = share["prompt_tokens"] + share["completion_tokens"]
+    return shares
+
+def _guardrail_regexes(guardrail: Dict[str, Any]) -> tuple:
+    """Return the values of a guardrail's regex patterns, in order."""
+    return tuple(
+        pattern["value"] for pattern in guardrail.get("patterns") or []
+        if pattern.get("type") == "regex" and pattern.get("value")
+    )
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(text: str, loader) -> Dict:
+    """
+    Parse YAML text once per distinct text and loader.
+    
+    Parsing the bundled data files takes most of a scanner's construction time, so
+    scanners created after the first reuse the parsed data. The result is shared and
+    must be copied before it is changed.
+    """
+    return loader(text) or {}
+
+# Synchronous SDK clients by class and settings. Weak values drop a client, and the API
+# key in its entry, once no scanner uses it any more.
+_shared_clients: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_shared_clients_lock = threading.Lock()
+
+def _shared_client(client_class, **kwargs):
+    """
+    Return a client_class client for kwargs, reusing one created earlier that is still in use.
+    
+    Scanners with the same provider settings then share the client's HTTP connection
+    pool, so only the first of them pays for connecting to the API. Closing the client
+    affects every scanner sharing it; a closed client is replaced for scanners created
+    afterwards. Only synchronous clients are shared: async clients are tied to the
+    event loop they were used on.
+    """
+    key = (client_class, tuple(sorted(kwargs.items())))
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None or getattr(client, "is_closed", lambda: False)() is True:
+            client = client_class(**kwargs)
+            _shared_clients[key] = client
+    return client
+
+class _CombinedRegex:
+    """
+    One named alternation over several patterns, each entry owning a group of regexes.
+    
+    A single search pass tells whether any entry can match. Entries are only trusted
+    to the combined regex while they are the same objects with the same regexes it was
+    built from; anything else, such as a guardrail whose patterns were changed in
+    place, must be checked on its own.
+    """
+    
+    def __init__(self, regex, literal_hints: Optional[List[str]], names: Dict[str, str], covered: Dict[str, Any]):
+        self.regex = regex
+        self.literal_hints = literal_hints
+        self.names = names
+        self.covered = covered
+    
+    @classmethod
+    def build(cls, entries: List[tuple], compile_regex) -> Optional["_CombinedRegex"]:
+        """
+        Combine (name, obj, regexes) entries whose regexes are all combinable.
+        
+        compile_regex must raise re.error for an invalid regex. Returns None when no
+        entry can be combined or the alternation doesn't compile.
+        """
+        parts = []
+        names = {}
+        covered = {}
+        for name, obj, values in entries:
+            if not values or not all(map(_is_combinable, values)):
+                continue
+            group = f"g{len(parts)}"
+            parts.append(f"(?P<{group}>" + "|".join(f"(?:{value})" for value in values) + ")")
+            names[group] = name
+            covered[name] = (obj, tuple(values))
+        
+        if not parts:
+            return None
+        
+        combined = "|".join(parts)
+        try:
+            regex = compile_regex(combined)
+        except re.error:
+            return None
+        return cls(regex, _required_literals(combined), names, covered)
+    
+    def covers(self, name: str, obj: Any, values: tuple) -> bool:
+        """Return True if the entry's verdict can be taken from match(), given its current regexes."""
+        entry = self.covered.get(name)
+        return entry is not None and entry[0] is obj and entry[1] == values
+    
+    def match(self, content: str, content_lower: Optional[str]) -> Optional[set]:
+        """
+        Run the combined regex once over content.
+        
+        Returns None if nothing matched, meaning no covered entry matches; otherwise
+        the names of the entries seen matching. Matches don't overlap, so a covered
+        entry missing from the set must still be checked on its own.
+        """
+        if _literals_absent({"literal_hints": self.literal_hints}, content_lower):
+            return None
+        first = self.regex.search(content)
+        if not first:
+            return None
+        return {self.names.get(match.lastgroup) for match in self.regex.finditer(content, first.start())}
 
-# Load environment variables from .env file
-load_dotenv()
 
 @dataclass
 class ScanResult:
@@ -51,12 +391,28 @@ class BasePromptScanner(ABC):
         # Custom user-defined guardrails and categories
         self.custom_guardrails = {}
         self.custom_categories = {}
+        # Policy sections of the evaluation prompt with the dictionaries they were built from
+        self._policy_prompt: Optional[tuple] = None
+        # One alternation over all custom privacy guardrails, rebuilt when they change
+        self._combined_custom: Optional[_CombinedRegex] = None
         
         # Compile regex patterns for better performance
         self._compile_patterns()
         
         # Should be set by subclasses
         self.client = None
+        # Created on first use of scan_text_async, and again for each new event loop
+        self.async_client = None
+        self._async_client_loop = None
+        
+        # Optional SemanticCache consulted before calling the LLM
+        self.semantic_cache = None
+        self.result_cache = None
+        
+        # Texts shorter than this with no risk signals skip the LLM; None disables the pre-filter
+        self.prefilter_max_length: Optional[int] = None
+        # Report texts violating a custom guardrail as unsafe without calling the LLM
+        self.guardrail_fast_reject = False
     
     def _load_yaml_data(self, filename: str) -> Dict:
         """Load data from a YAML file in the data directory."""
@@ -65,20 +421,92 @@ class BasePromptScanner(ABC):
         
         try:
             with open(filepath, "r") as f:
-                return yaml.safe_load(f) or {}
+                text = f.read()
         except FileNotFoundError:
             # Return empty dict if file doesn't exist yet
             return {}
+        # Compiling patterns adds keys to the data, so each scanner gets its own copy
+        return copy.deepcopy(_parse_yaml(text, yaml.safe_load))
     
     def _compile_patterns(self):
-        """Compile regex patterns from injection_patterns for better performance."""
+        """Compile regex patterns from injection_patterns and guardrails for better performance."""
         for pattern_name, pattern_data in self.injection_patterns.items():
             if pattern_data.get("regex"):
-                try:
-                    pattern_data["compiled_regex"] = re.compile(pattern_data["regex"], re.IGNORECASE)
-                except re.error:
-                    # If regex is invalid, create a fallback pattern that matches the literal string
-                    pattern_data["compiled_regex"] = re.compile(re.escape(pattern_data["regex"]), re.IGNORECASE)
+                pattern_data["compiled_regex"] = self._compile_regex(pattern_data["regex"])
+                pattern_data["literal_hints"] = _required_literals(pattern_data["regex"])
+        
+        # One alternation over all injection patterns, so a message is usually scanned once
+        self._combined_injection = _CombinedRegex.build(
+            [
+                (name, pattern, [pattern["regex"]])
+                for name, pattern in self.injection_patterns.items() if pattern.get("regex")
+            ],
+            lambda regex: re.compile(regex, re.IGNORECASE)
+        )
+        
+        for guardrail_name, guardrail in self.guardrails.items():
+            self._compile_guardrail_patterns(guardrail)
+    
+    def _compile_regex(self, value: str):
+        """Compile a regex once, falling back to a literal match if the regex is invalid."""
+        try:
+            return re.compile(value, re.IGNORECASE)
+        except re.error:
+            # If regex is invalid, create a fallback pattern that matches the literal string
+            return re.compile(re.escape(value), re.IGNORECASE)
+    
+    def _compile_user_regex(self, value: str, strict: bool = False) -> tuple:
+        """
+        Compile a user-supplied regex, returning the compiled regex and the engine used.
+        
+        When RE2 is installed it is tried first: it matches in linear time, so a crafted
+        pattern or message can't make the scan backtrack catastrophically. Regexes RE2
+        rejects, such as lookarounds and backreferences, fall back to the re module.
+        With strict=True an invalid regex raises re.error instead of being matched
+        literally.
+        """
+        if re2 is not None:
+            try:
+                return re2.compile("(?i)" + value), "re2"
+            except Exception:
+                pass
+        if strict:
+            return re.compile(value, re.IGNORECASE), "re"
+        return self._compile_regex(value), "re"
+    
+    def _compile_guardrail_patterns(self, guardrail: Dict[str, Any], custom: bool = False) -> None:
+        """
+        Attach compiled regexes to a guardrail's regex patterns so scans never recompile them.
+        
+        Patterns that can share an alternation are also merged into the guardrail's
+        combined_regex, so they are checked in a single pass over the content; the rest
+        are marked as uncombinable and keep being checked one by one. Custom guardrails
+        are compiled with RE2 when it is available.
+        """
+        combinable = []
+        for pattern in guardrail.get("patterns") or []:
+            if pattern.get("type") == "regex" and pattern.get("value"):
+                if custom:
+                    pattern["compiled_regex"], pattern["engine"] = self._compile_user_regex(pattern["value"])
+                else:
+                    pattern["compiled_regex"] = self._compile_regex(pattern["value"])
+                pattern["literal_hints"] = _required_literals(pattern["value"])
+                pattern["combinable"] = _is_combinable(pattern["value"])
+                if pattern["combinable"]:
+                    combinable.append(pattern["value"])
+        
+        guardrail.pop("combined_regex", None)
+        guardrail.pop("combined_literal_hints", None)
+        if len(combinable) > 1:
+            combined = "|".join(f"(?:{value})" for value in combinable)
+            try:
+                guardrail["combined_regex"] = (
+                    self._compile_user_regex(combined, strict=True)[0] if custom else re.compile(combined, re.IGNORECASE)
+                )
+            except re.error:
+                # Keep checking the patterns one by one
+                return
+            guardrail["combined_literal_hints"] = _required_literals(combined)
     
     def _count_tokens(self, text: str) -> int:
         """
@@ -99,14 +527,35 @@ class BasePromptScanner(ABC):
     
     @abstractmethod
     def _scan_prompt(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Scan a provider-specific prompt."""
+        """Scan a provider-specific prompt, given as a dictionary or as returned by _parse_prompt."""
         pass
     
+    def _parse_prompt(self, prompt: Dict[str, Any]) -> Optional[Any]:
+        """
+        Validate prompt into the provider's prompt model, returning None if it doesn't validate.
+        
+        scan() hands the model to _scan_prompt so a valid prompt is only validated once.
+        The default returns None, which makes scan() validate and scan the dictionary.
+        """
+        return None
+    
     @abstractmethod
     def _call_content_evaluation(self, prompt, text) -> tuple:
         """Call the LLM to evaluate content."""
         pass
     
+    async def _call_content_evaluation_async(self, prompt, text) -> tuple:
+        """
+        Call the LLM to evaluate content without blocking the event loop.
+        
+        Providers override this with their native async client; by default the
+        synchronous call is run in the loop's thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._call_content_evaluation, prompt, text)
+        )
+    
     def scan(self, prompt: Dict[str, Any]) -> ScanResult:
         """
         Scan a prompt for potential injection attacks and apply guardrails.
@@ -119,13 +568,16 @@ class BasePromptScanner(ABC):
         """
         issues = []
         
-        # Validate prompt structure
-        validation_issues = self._validate_prompt_structure(prompt)
-        if validation_issues:
-            return ScanResult(is_safe=False, issues=validation_issues)
+        # Validate prompt structure; only a prompt that doesn't parse needs its issues listed
+        validated_prompt = self._parse_prompt(prompt)
+        if validated_prompt is None:
+            validation_issues = self._validate_prompt_structure(prompt)
+            if validation_issues:
+                return ScanResult(is_safe=False, issues=validation_issues)
+            validated_prompt = prompt
         
         # Scan the prompt
-        issues.extend(self._scan_prompt(prompt))
+        issues.extend(self._scan_prompt(validated_prompt))
         
         return ScanResult(
             is_safe=len(issues) == 0,
@@ -142,119 +594,385 @@ class BasePromptScanner(ABC):
         Returns:
             PromptScanResult: Object containing content safety scan results
         """
+        prefiltered = self._prefilter_result(text, self.guardrail_fast_reject)
+        if prefiltered is not None:
+            return prefiltered
+        return self._evaluate_text(text)
+    
+    def _evaluate_text(self, text: str) -> PromptScanResult:
+        """Evaluate text with the LLM, or return a cached result for it."""
+        cached = self._get_cached_result(text)
+        if cached is not None:
+            return cached
+        
         prompt = self._create_evaluation_prompt(text)
         
         try:
             response_text, token_usage = self._call_content_evaluation(prompt, text)
         except Exception as e:
-            return PromptScanResult(
-                is_safe=True,  # Default to safe on error
-                reasoning=f"Error during content evaluation: {str(e)}",
-                token_usage={"prompt_tokens": self._count_tokens(text)}
-            )
+            return self._evaluation_error_result(e, text)
+        
+        return self._finish_scan(text, response_text, token_usage)
+    
+    def _get_async_client(self):
+        """
+        Return the async client for the running event loop, creating it if needed.
+        
+        The SDK client's connection pool is bound to the loop it was first used on, so
+        each asyncio.run call, which starts a new loop, gets a client of its own.
+        """
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or (self._async_client_loop is not None and self._async_client_loop is not loop):
+            self._setup_async_client()
+        self._async_client_loop = loop
+        return self.async_client
+    
+    def _scan_prompt_text(self, text: str) -> PromptScanResult:
+        """
+        Scan the text of a prompt message without guardrail fast reject.
+        
+        scan() reports custom guardrail violations as issues of their own, so the
+        message still gets its LLM evaluation instead of a second guardrail verdict.
+        """
+        if self.guardrail_fast_reject:
+            return self._prefilter_result(text) or self._evaluate_text(text)
+        return self.scan_text(text)
+    
+    async def scan_text_async(self, text: str) -> PromptScanResult:
+        """
+        Asynchronously scan text content for unsafe content using LLM-based evaluation.
+        
+        Lets many texts be evaluated concurrently, e.g. with asyncio.gather.
+        
+        Args:
+            text: The input text to scan
+            
+        Returns:
+            PromptScanResult: Object containing content safety scan results
+        """
+        prefiltered = self._prefilter_result(text, self.guardrail_fast_reject)
+        if prefiltered is not None:
+            return prefiltered
+        
+        # Semantic cache lookups and stores embed the text, which would stall the event loop
+        loop = asyncio.get_running_loop()
+        if self.semantic_cache is None:
+            cached = self._get_cached_result(text)
+        else:
+            cached = await loop.run_in_executor(None, self._get_cached_result, text)
+        if cached is not None:
+            return cached
+        
+        prompt = self._create_evaluation_prompt(text)
         
-        # Parse the response
         try:
-            result = json.loads(response_text)
-            is_safe = result.get("is_safe", True)
-            reasoning = result.get("reasoning", "No reasoning provided")
-            
-            if not is_safe and "categories" in result:
-                # Get the primary category (highest confidence)
-                categories = result["categories"]
-                if not categories:
-                    return PromptScanResult(
-                        is_safe=True,
-                        reasoning="No specific unsafe categories identified",
-                        token_usage=token_usage
-                    )
-                    
-                # Sort categories by confidence (descending)
-                sorted_categories = sorted(categories, key=lambda x: x.get("confidence", 0), reverse=True)
-                primary_category = sorted_categories[0]
-                
-                # Create category object
-                category = PromptCategory(
-                    id=primary_category.get("id", "unknown"),
-                    name=primary_category.get("name", "Unspecified"),
-                    confidence=primary_category.get("confidence", 0.5),
-                    matched_patterns=primary_category.get("matched_patterns", [])
+            response_text, token_usage = await self._call_content_evaluation_async(prompt, text)
+        except Exception as e:
+            return self._evaluation_error_result(e, text)
+        
+        if self.semantic_cache is None:
+            return self._finish_scan(text, response_text, token_usage)
+        return await loop.run_in_executor(None, self._finish_scan, text, response_text, token_usage)
+    
+    async def scan_texts_async(self, texts: List[str], max_concurrency: int = 5) -> List[PromptScanResult]:
+        """
+        Asynchronously scan many texts, with at most max_concurrency LLM calls in flight.
+        
+        Each text is evaluated on its own with scan_text_async over a shared async client,
+        so the connection is reused and total time is bounded by the slowest calls rather
+        than the sum of all calls. Rate-limited requests are retried with backoff by the
+        provider SDK.
+        
+        Args:
+            texts: The input texts to scan
+            max_concurrency: Maximum number of evaluations running at once
+            
+        Returns:
+            List[PromptScanResult]: One result per input text, in the same order
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def scan_one(text: str) -> PromptScanResult:
+            async with semaphore:
+                return await self.scan_text_async(text)
+        
+        # gather preserves the input order of the results
+        return list(await asyncio.gather(*(scan_one(text) for text in texts)))
+    
+    def scan_text_batch(self, texts: List[str]) -> List[PromptScanResult]:
+        """
+        Scan several texts for unsafe content with a single LLM call.
+        
+        The evaluation instructions are sent once for the whole batch instead of once per
+        text. Texts whose evaluation is missing from the response, or all of them if the
+        batch call fails or returns the wrong number of evaluations, are scanned one by
+        one with scan_text. The token usage of each batch-evaluated result is its share of
+        the batch call, split so that the shares add up to the usage billed for the call.
+        
+        Args:
+            texts: The input texts to scan
+            
+        Returns:
+            List[PromptScanResult]: One result per input text, in the same order
+        """
+        return self._scan_text_batch(texts, self.guardrail_fast_reject)
+    
+    def _scan_text_batch(self, texts: List[str], fast_reject: bool) -> List[PromptScanResult]:
+        """Scan texts with one LLM call as scan_text_batch does, applying guardrail fast reject only if fast_reject is set."""
+        results: List[Optional[PromptScanResult]] = [
+            self._prefilter_result(text, fast_reject) or self._get_cached_result(text) for text in texts
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if len(pending) > 1:
+            batch = [texts[i] for i in pending]
+            prompt = self._create_batch_evaluation_prompt(batch)
+            
+            try:
+                response_text, token_usage = self._call_content_evaluation(prompt, "\n".join(batch))
+            except Exception:
+                evaluations = None
+            else:
+                evaluations = self._split_batch_response(response_text, len(batch))
+            
+            if evaluations is not None:
+                answered = [(i, evaluation) for i, evaluation in zip(pending, evaluations) if isinstance(evaluation, dict)]
+                # Split the call's usage over the texts it answered; the others are scanned again below
+                shares = _split_token_usage(token_usage, len(answered)) if answered else []
+                for (i, evaluation), item_usage in zip(answered, shares):
+                    results[i] = self._build_scan_result(evaluation, item_usage)
+                    self._cache_result(texts[i], results[i])
+        
+        # Anything the batch call couldn't answer is scanned individually
+        scan_one = self.scan_text if fast_reject else self._scan_prompt_text
+        return [
+            result if result is not None else scan_one(text)
+            for text, result in zip(texts, results)
+        ]
+    
+    def _create_batch_evaluation_prompt(self, texts: List[str]):
+        """Create the evaluation prompt for several texts, reusing the single-text instructions."""
+        batch_input = (
+            f"a JSON array of {len(texts)} separate texts. Evaluate each text independently "
+            f"and respond with a JSON object of the form {{\"results\": [...]}} whose results array "
+            f"holds exactly {len(texts)} evaluations in the JSON format described above, "
+            f"in the same order as the texts.\n\n{json.dumps(texts, ensure_ascii=False)}"
+        )
+        return self._create_evaluation_prompt(batch_input)
+    
+    def _split_batch_response(self, response_text: str, count: int) -> Optional[List[Any]]:
+        """Return the per-text evaluations of a batch response, or None if it can't be used."""
+        try:
+            response = parse_json(response_text)
+        except json.JSONDecodeError:
+            return None
+        
+        evaluations = response.get("results") if isinstance(response, dict) else response
+        if not isinstance(evaluations, list) or len(evaluations) != count:
+            return None
+        return evaluations
+    
+    def _evaluation_error_result(self, error: Exception, text: str) -> PromptScanResult:
+        """Build the result returned when the content evaluation call fails."""
+        return PromptScanResult(
+            is_safe=True,  # Default to safe on error
+            reasoning=f"Error during content evaluation: {str(error)}",
+            token_usage={"prompt_tokens": self._count_tokens(text)}
+        )
+    
+    def _parse_evaluation_response(self, response_text: str, token_usage: Dict[str, int]) -> Optional[PromptScanResult]:
+        """Parse the LLM's JSON evaluation response, returning None if it isn't valid JSON."""
+        try:
+            result = parse_json(response_text)
+        except json.JSONDecodeError:
+            return None
+        
+        return self._build_scan_result(result, token_usage)
+    
+    def _build_scan_result(self, result: Dict[str, Any], token_usage: Dict[str, int]) -> PromptScanResult:
+        """Build a PromptScanResult from one decoded evaluation object."""
+        is_safe = result.get("is_safe", True)
+        reasoning = result.get("reasoning", "No reasoning provided")
+        
+        if not is_safe and "categories" in result:
+            # Get the primary category (highest confidence)
+            categories = result["categories"]
+            if not categories:
+                return PromptScanResult(
+                    is_safe=True,
+                    reasoning="No specific unsafe categories identified",
+                    token_usage=token_usage
                 )
+            
+            # Sort categories by confidence (descending)
+            sorted_categories = sorted(categories, key=_category_confidence, reverse=True)
+            primary_category = sorted_categories[0]
+            
+            # Create category object
+            category = PromptCategory(
+                id=primary_category.get("id", "unknown"),
+                name=primary_category.get("name", "Unspecified"),
+                confidence=primary_category.get("confidence", 0.5),
+                matched_patterns=primary_category.get("matched_patterns", [])
+            )
+            
+            # Process severity information from the model response
+            severity = None
+            if "severity" in primary_category:
+                severity_data = primary_category["severity"]
+                severity_level_str = severity_data.get("level", "MEDIUM")
                 
-                # Process severity information from the model response
-                severity = None
-                if "severity" in primary_category:
-                    severity_data = primary_category["severity"]
-                    severity_level_str = severity_data.get("level", "MEDIUM")
-                    
-                    # Try to convert string to enum
-                    try:
-                        severity_level = SeverityLevel(severity_level_str)
-                    except ValueError:
-                        # Default to MEDIUM if invalid level
-                        severity_level = SeverityLevel.MEDIUM
-                    
-                    severity = CategorySeverity(
-                        level=severity_level,
-                        score=category.confidence,
-                        description=severity_data.get("description", "")
-                    )
+                # Try to convert string to enum
+                try:
+                    severity_level = SeverityLevel(severity_level_str)
+                except ValueError:
+                    # Default to MEDIUM if invalid level
+                    severity_level = SeverityLevel.MEDIUM
                 
-                # If no severity provided by the model, create a default one based on confidence
-                if severity is None:
-                    confidence = category.confidence
+                severity = CategorySeverity(
+                    level=severity_level,
+                    score=category.confidence,
+                    description=severity_data.get("description", "")
+                )
+            
+            # If no severity provided by the model, create a default one based on confidence
+            if severity is None:
+                confidence = category.confidence
+                severity_level = SeverityLevel.MEDIUM
+                severity_description = "Moderate risk detected"
+                
+                if confidence >= 0.8:
+                    severity_level = SeverityLevel.HIGH
+                    severity_description = "High risk with strong confidence"
+                elif confidence >= 0.6:
                     severity_level = SeverityLevel.MEDIUM
-                    severity_description = "Moderate risk detected"
-                    
-                    if confidence >= 0.8:
-                        severity_level = SeverityLevel.HIGH
-                        severity_description = "High risk with strong confidence"
-                    elif confidence >= 0.6:
-                        severity_level = SeverityLevel.MEDIUM
-                        severity_description = "Medium risk with moderate confidence" 
-                    elif confidence >= 0.4:
-                        severity_level = SeverityLevel.LOW
-                        severity_description = "Low risk with weak confidence"
-                    
-                    # Check if the category indicates a critical issue
-                    critical_categories = ["illegal_content", "child_exploitation", "violence_incitement"]
-                    if primary_category.get("id") in critical_categories:
-                        severity_level = SeverityLevel.CRITICAL
-                        severity_description = "Critical safety violation detected"
-                        
-                    severity = CategorySeverity(
-                        level=severity_level,
-                        score=confidence,
-                        description=severity_description
-                    )
+                    severity_description = "Medium risk with moderate confidence" 
+                elif confidence >= 0.4:
+                    severity_level = SeverityLevel.LOW
+                    severity_description = "Low risk with weak confidence"
                 
-                # Include information about secondary categories in the reasoning
-                if len(sorted_categories) > 1:
-                    secondary_info = "Additional categories: "
-                    for cat in sorted_categories[1:]:
-                        secondary_info += f"{cat.get('name', 'Unknown')} (confidence: {cat.get('confidence', 0):.2f}), "
-                    reasoning += "\n\n" + secondary_info.rstrip(", ")
+                # Check if the category indicates a critical issue
+                critical_categories = ["illegal_content", "child_exploitation", "violence_incitement"]
+                if primary_category.get("id") in critical_categories:
+                    severity_level = SeverityLevel.CRITICAL
+                    severity_description = "Critical safety violation detected"
                 
-                return PromptScanResult(
-                    is_safe=False,
-                    category=category,
-                    severity=severity,
-                    reasoning=reasoning,
-                    token_usage=token_usage,
-                    all_categories=sorted_categories
+                severity = CategorySeverity(
+                    level=severity_level,
+                    score=confidence,
+                    description=severity_description
                 )
-            else:
-                return PromptScanResult(
-                    is_safe=True,
-                    reasoning=reasoning,
-                    token_usage=token_usage
+            
+            # Include information about secondary categories in the reasoning
+            if len(sorted_categories) > 1:
+                secondary_info = ", ".join(
+                    f"{cat.get('name', 'Unknown')} (confidence: {cat.get('confidence', 0):.2f})"
+                    for cat in sorted_categories[1:]
                 )
-        except json.JSONDecodeError:
+                reasoning += "\n\nAdditional categories: " + secondary_info
+            
+            return PromptScanResult(
+                is_safe=False,
+                category=category,
+                severity=severity,
+                reasoning=reasoning,
+                token_usage=token_usage,
+                all_categories=sorted_categories
+            )
+        else:
+            return PromptScanResult(
+                is_safe=True,
+                reasoning=reasoning,
+                token_usage=token_usage
+            )
+    
+    def _finish_scan(self, text: str, response_text: str, token_usage: Dict[str, int]) -> PromptScanResult:
+        """Turn an evaluation response into a result, caching it if it was parsed successfully."""
+        scan_result = self._parse_evaluation_response(response_text, token_usage)
+        if scan_result is None:
             return PromptScanResult(
                 is_safe=True,  # Default to safe on parsing error
                 reasoning="Error parsing content evaluation response",
                 token_usage=token_usage
             )
+        
+        self._cache_result(text, scan_result)
+        return scan_result
+    
+    def _prefilter_result(self, text: str, fast_reject: bool = False) -> Optional[PromptScanResult]:
+        """
+        Return a result for text decided without an LLM call, or None if the LLM is needed.
+        
+        When fast_reject is set, text violating a custom guardrail is reported
+        unsafe with the guardrail as its category. When prefilter_max_length is set,
+        ASCII texts shorter than it that contain none of the RISK_KEYWORDS are reported
+        safe if they pass every custom guardrail. Anything else, including non-English
+        text, goes to the LLM.
+        """
+        may_be_safe = self.prefilter_max_length is not None and len(text) < self.prefilter_max_length
+        if not may_be_safe and not fast_reject:
+            return None
+        
+        text_lower = _lower_for_prefilter(text)
+        if may_be_safe and (text_lower is None or _RISK_KEYWORDS_REGEX.search(text_lower)):
+            if not fast_reject:
+                return None
+            may_be_safe = False
+        
+        violated = self._violated_custom_guardrails(text, text_lower)
+        if violated:
+            if fast_reject:
+                return self._guardrail_violation_result(violated)
+            return None
+        if not may_be_safe:
+            return None
+        
+        return PromptScanResult(
+            is_safe=True,
+            reasoning="Pre-filter: no risk signals found",
+            metadata={"prefiltered": True}
+        )
+    
+    def _guardrail_violation_result(self, violated: List[str]) -> PromptScanResult:
+        """Build the unsafe result for text that violates the named custom guardrails."""
+        categories = [
+            {"id": name, "name": name, "confidence": 1.0,
+             "description": self.custom_guardrails[name].get("description", "")}
+            for name in violated
+        ]
+        first = categories[0]
+        return PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id=first["id"], name=first["name"], confidence=1.0),
+            # Matches the "high" severity of guardrail violations reported by scan()
+            severity=CategorySeverity(level=SeverityLevel.HIGH, score=1.0),
+            all_categories=categories,
+            reasoning=f"Violates custom guardrail(s): {', '.join(violated)}",
+            metadata={"prefiltered": True, "guardrails": violated}
+        )
+    
+    def _get_cached_result(self, text: str) -> Optional[PromptScanResult]:
+        """Return a previously cached result for text, if any cache holds one."""
+        # The exact-match cache is checked first as it doesn't need an embedding
+        if self.result_cache is not None:
+            cached = self.result_cache.get(text, self.model, self._policy_fingerprint())
+            if cached is not None:
+                return cached
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.get(text)
+            if cached is not None and self.result_cache is not None:
+                self.result_cache.put(text, self.model, cached, self._policy_fingerprint())
+            return cached
+        return None
+    
+    def _cache_result(self, text: str, result: PromptScanResult) -> None:
+        """Store a successful evaluation result in the configured caches."""
+        if self.result_cache is not None:
+            self.result_cache.put(text, self.model, result, self._policy_fingerprint())
+        if self.semantic_cache is not None:
+            self.semantic_cache.put(text, result)
     
     # For backward compatibility
     def scan_content(self, text: str) -> PromptScanResult:
@@ -270,15 +988,9 @@ class BasePromptScanner(ABC):
             guardrail_data: Dictionary containing guardrail configuration
         """
         self.custom_guardrails[name] = guardrail_data
-        # Recompile patterns if needed
-        if "patterns" in guardrail_data:
-            for pattern in guardrail_data.get("patterns", []):
-                if pattern.get("type") == "regex" and pattern.get("value"):
-                    try:
-                        pattern["compiled_regex"] = re.compile(pattern["value"], re.IGNORECASE)
-                    except re.error:
-                        # If regex is invalid, create a fallback pattern
-                        pattern["compiled_regex"] = re.compile(re.escape(pattern["value"]), re.IGNORECASE)
+        # Compile patterns once here rather than on every scan
+        self._compile_guardrail_patterns(guardrail_data, custom=True)
+        self._rebuild_combined_custom_regex()
     
     def remove_custom_guardrail(self, name: str) -> bool:
         """
@@ -292,8 +1004,25 @@ class BasePromptScanner(ABC):
         """
         if name in self.custom_guardrails:
             del self.custom_guardrails[name]
+            self._rebuild_combined_custom_regex()
             return True
         return False
+    
+    def _rebuild_combined_custom_regex(self) -> None:
+        """
+        Merge the patterns of all custom privacy guardrails into one named alternation.
+        
+        Only guardrails whose regex patterns are all combinable are included; their
+        verdict is then decided by a single pass over the content. Other guardrails
+        keep going through _check_guardrail.
+        """
+        self._combined_custom = _CombinedRegex.build(
+            [
+                (name, guardrail, _guardrail_regexes(guardrail))
+                for name, guardrail in self.custom_guardrails.items() if guardrail.get("type") == "privacy"
+            ],
+            lambda regex: self._compile_user_regex(regex, strict=True)[0]
+        )
         
     def add_custom_category(self, category_id: str, category_data: Dict[str, Any]) -> None:
         """
@@ -307,6 +1036,14 @@ class BasePromptScanner(ABC):
             self.custom_categories["policies"] = {}
         
         self.custom_categories["policies"][category_id] = category_data
+        self._policy_prompt = None
+        # Results evaluated against the previous categories can no longer be hit, as the
+        # policy fingerprint is part of the key; stored results stay for other scanners
+        if self.result_cache is not None:
+            self.result_cache.clear_memory()
+        # The semantic cache isn't keyed by policy, so its verdicts are all stale
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
     
     def remove_custom_category(self, category_id: str) -> bool:
         """
@@ -320,104 +1057,180 @@ class BasePromptScanner(ABC):
         """
         if "policies" in self.custom_categories and category_id in self.custom_categories["policies"]:
             del self.custom_categories["policies"][category_id]
+            self._policy_prompt = None
+            if self.result_cache is not None:
+                self.result_cache.clear_memory()
+            if self.semantic_cache is not None:
+                self.semantic_cache.clear()
             return True
         return False
     
+    def _format_policies_for_prompt(self) -> str:
+        """
+        Return the categories and examples sections of the evaluation prompt, separated by a blank line.
+        
+        The sections are built once and reused until custom categories are added or
+        removed, or content_policies or custom_categories is replaced.
+        """
+        cached = self._policy_prompt
+        if cached is None or cached[0] is not self.content_policies or cached[1] is not self.custom_categories:
+            sections = self._format_categories_for_prompt() + "\n\n" + self._format_examples_for_prompt()
+            fingerprint = hashlib.blake2b(sections.encode("utf-8"), digest_size=8).hexdigest()
+            cached = self._policy_prompt = (self.content_policies, self.custom_categories, sections, fingerprint)
+        return cached[2]
+    
+    def _policy_fingerprint(self) -> str:
+        """Return a hash of the policy sections, used to key cached results by the policies they were made under."""
+        self._format_policies_for_prompt()
+        return self._policy_prompt[3]
+    
     def _format_categories_for_prompt(self) -> str:
         """Format content policy categories for inclusion in the prompt."""
-        formatted = "Content Policy Categories:\n"
+        parts = ["Content Policy Categories:\n"]
         # Add built-in categories
         if "policies" in self.content_policies:
             for id, policy in self.content_policies["policies"].items():
-                formatted += f"{id}. {policy['name']}: {policy['description']}\n"
+                parts.append(f"{id}. {policy['name']}: {policy['description']}\n")
         
         # Add custom categories
         if "policies" in self.custom_categories:
             for id, policy in self.custom_categories["policies"].items():
-                formatted += f"{id}. {policy['name']}: {policy['description']}\n"
+                parts.append(f"{id}. {policy['name']}: {policy['description']}\n")
                 
                 # If examples are available, include one as a reasoning example
                 examples = policy.get("examples", [])
                 if examples:
-                    formatted += f"   Reasoning: Content that asks for or provides information about {policy['name'].lower()} violates safety guidelines. "
-                    formatted += f"For example, \"{examples[0]}\" would be unsafe because it explicitly seeks instructions for harmful activities.\n"
+                    parts.append(f"   Reasoning: Content that asks for or provides information about {policy['name'].lower()} violates safety guidelines. ")
+                    parts.append(f"For example, \"{examples[0]}\" would be unsafe because it explicitly seeks instructions for harmful activities.\n")
         
-        return formatted
+        return "".join(parts)
     
     def _format_examples_for_prompt(self) -> str:
         """Format examples from content policies for inclusion in the prompt."""
-        formatted = "Examples of unsafe content by category:\n"
+        parts = ["Examples of unsafe content by category:\n"]
         
         if "policies" in self.content_policies:
             for id, policy in self.content_policies["policies"].items():
                 name = policy.get("name", "Unknown")
-                formatted += f"\n{id}. {name}:\n"
+                parts.append(f"\n{id}. {name}:\n")
                 
-                # Add examples if available
-                examples = policy.get("examples", [])
-                # Limit examples to 5 to keep prompt length reasonable
-                example_subset = examples[:5] if len(examples) > 5 else examples
-                for example in example_subset:
-                    formatted += f"  - {example}\n"
+                # Add examples if available, limited to 5 to keep prompt length reasonable
+                parts.extend(f"  - {example}\n" for example in policy.get("examples", [])[:5])
         
-        return formatted
+        return "".join(parts)
     
     @abstractmethod
     def _create_evaluation_prompt(self, text: str):
         """Create the prompt to send to the LLM for content evaluation."""
         pass
     
-    def _check_content_for_issues(self, content: str, index: int, issues: List[Dict[str, Any]], is_system_message: bool = False):
-        """Check content string for injection patterns and guardrail violations."""
+    def _scan_contents(self, contents: List[tuple], issues: List[Dict[str, Any]]) -> None:
+        """
+        Check the (content, index, is_system_message) entries of a prompt for issues.
+        
+        The text contents are evaluated by the LLM together with one batch call, with
+        repeated texts sent once, instead of one scan_text call per message. Guardrail
+        fast reject is not applied, as violations are reported as issues of their own.
+        """
+        texts = list(dict.fromkeys(
+            content for content, _, _ in contents if isinstance(content, str) and _needs_llm_evaluation(content)
+        ))
+        results = dict(zip(texts, self._scan_text_batch(texts, fast_reject=False))) if texts else {}
+        
+        for content, index, is_system_message in contents:
+            self._check_content_for_issues(
+                content, index, issues, is_system_message,
+                content_result=results.get(content) if isinstance(content, str) else None
+            )
+    
+    def _check_content_for_issues(self, content: str, index: int, issues: List[Dict[str, Any]], is_system_message: bool = False,
+                                  content_result: Optional[PromptScanResult] = None):
+        """
+        Check content string for injection patterns, guardrail violations and unsafe content.
+        
+        content_result is the LLM evaluation of content if it was already scanned;
+        otherwise content is scanned with scan_text.
+        """
+        # Lowercase once so each pattern's required literals can rule it out before its regex runs
+        content_lower = _lower_for_prefilter(content)
             
-        # Check content for injection patterns
+        # Check content for injection patterns, deciding the combinable ones with one regex pass
+        combined = self._combined_injection
+        matched = combined.match(content, content_lower) if combined is not None else None
+        
         for pattern_name, pattern in self.injection_patterns.items():
             # Skip patterns with exempt_system_role=True when checking system messages
             if is_system_message and pattern.get("exempt_system_role", False):
                 continue
+            
+            if combined is not None and combined.covers(pattern_name, pattern, (pattern.get("regex"),)):
+                # The combined pass already ruled out or confirmed most covered patterns
+                if matched is None:
+                    continue
+                found = pattern_name in matched or (
+                    not _literals_absent(pattern, content_lower) and self._check_pattern(content, pattern)
+                )
+            else:
+                found = not _literals_absent(pattern, content_lower) and self._check_pattern(content, pattern)
                 
-            if self._check_pattern(content, pattern):
-                issues.append({
-                    "type": "potential_injection",
-                    "pattern": pattern_name,
-                    "message_index": index,
-                    "description": pattern.get("description", "Potential prompt injection detected"),
-                    "severity": pattern.get("severity", "medium")
-                })
+            if found:
+                issues.append(Issue(
+                    type="potential_injection",
+                    pattern=pattern_name,
+                    message_index=index,
+                    description=pattern.get("description", "Potential prompt injection detected"),
+                    severity=pattern.get("severity", "medium")
+                ))
         
         # Apply built-in guardrails
         for guardrail_name, guardrail in self.guardrails.items():
             if not self._check_guardrail(content, guardrail):
-                issues.append({
-                    "type": "guardrail_violation",
-                    "guardrail": guardrail_name,
-                    "message_index": index,
-                    "description": guardrail.get("description", "Guardrail violation detected"),
-                    "severity": "high"
-                })
+                issues.append(Issue(
+                    type="guardrail_violation",
+                    guardrail=guardrail_name,
+                    message_index=index,
+                    description=guardrail.get("description", "Guardrail violation detected"),
+                    severity="high"
+                ))
         
         # Apply custom guardrails
+        for guardrail_name in self._violated_custom_guardrails(content, content_lower):
+            issues.append(Issue(
+                type="guardrail_violation",
+                guardrail=guardrail_name,
+                message_index=index,
+                description=self.custom_guardrails[guardrail_name].get("description", "Custom guardrail violation detected"),
+                severity="high",
+                custom=True
+            ))
+        
+        # Run LLM-based content safety check, unless the message is too short and numeric to judge
+        if content_result is None and _needs_llm_evaluation(content):
+            content_result = self._scan_prompt_text(content)
+        if content_result is not None and not content_result.is_safe:
+            issues.append(Issue(
+                type="unsafe_content",
+                message_index=index,
+                category=content_result.category.model_dump() if content_result.category else None,
+                description=content_result.reasoning,
+                severity="high"
+            ))
+    
+    def _violated_custom_guardrails(self, content: str, content_lower: Optional[str]) -> List[str]:
+        """Return the names of the custom guardrails content violates, deciding the combinable ones with one regex pass."""
+        combined = self._combined_custom
+        matched = combined.match(content, content_lower) if combined is not None else None
+        
+        violated = []
         for guardrail_name, guardrail in self.custom_guardrails.items():
-            if not self._check_guardrail(content, guardrail):
-                issues.append({
-                    "type": "guardrail_violation",
-                    "guardrail": guardrail_name,
-                    "message_index": index,
-                    "description": guardrail.get("description", "Custom guardrail violation detected"),
-                    "severity": "high",
-                    "custom": True
-                })
-        
-        # Run LLM-based content safety check
-        content_result = self.scan_text(content)
-        if not content_result.is_safe:
-            issues.append({
-                "type": "unsafe_content",
-                "message_index": index,
-                "category": content_result.category.model_dump() if content_result.category else None,
-                "description": content_result.reasoning,
-                "severity": "high"
-            })
+            if combined is not None and combined.covers(guardrail_name, guardrail, _guardrail_regexes(guardrail)):
+                if matched is None:
+                    continue
+                if guardrail_name in matched or not self._check_guardrail(content, guardrail):
+                    violated.append(guardrail_name)
+            elif not self._check_guardrail(content, guardrail):
+                violated.append(guardrail_name)
+        return violated
     
     def _check_pattern(self, content: str, pattern: Dict[str, Any]) -> bool:
         """Check if content matches a pattern using compiled regex."""
@@ -433,15 +1246,26 @@ class BasePromptScanner(ABC):
         guardrail_type = guardrail.get("type")
         
         if guardrail_type == "privacy":
+            content_lower = _lower_for_prefilter(content)
+            combined_regex = guardrail.get("combined_regex")
+            if combined_regex is not None:
+                # One pass covers every combinable pattern of this guardrail
+                hints = {"literal_hints": guardrail.get("combined_literal_hints")}
+                if not _literals_absent(hints, content_lower) and combined_regex.search(content):
+                    return False
+            
             # Check for PII patterns
             for pattern in guardrail.get("patterns", []):
                 if pattern.get("type") == "regex" and pattern.get("value"):
-                    if "compiled_regex" in pattern:
-                        if pattern["compiled_regex"].search(content):
-                            return False
-                    else:
-                        if re.search(pattern["value"], content, re.IGNORECASE):
-                            return False
+                    if combined_regex is not None and pattern.get("combinable"):
+                        continue
+                    if _literals_absent(pattern, content_lower):
+                        continue
+                    if "compiled_regex" not in pattern:
+                        # Patterns added after the scanner compiled its guardrails are compiled on first use
+                        pattern["compiled_regex"] = self._compile_regex(pattern["value"])
+                    if pattern["compiled_regex"].search(content):
+                        return False
         
         # Check for other guardrail types
         if guardrail_type == "format" and "formats" in guardrail:
@@ -478,9 +1302,9 @@ class OpenAIPromptScanner(BasePromptScanner):
     def _setup_client(self):
         """Setup OpenAI client."""
         if hasattr(self, 'base_url') and self.base_url:
-            self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+            self.client = _shared_client(_sdk_class("OpenAI"), api_key=self.api_key, base_url=self.base_url)
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = _shared_client(_sdk_class("OpenAI"), api_key=self.api_key)
     
     def _validate_prompt_structure(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Validate OpenAI prompt structure."""
@@ -490,56 +1314,58 @@ class OpenAIPromptScanner(BasePromptScanner):
             OpenAIPrompt(**prompt)
         except ValidationError as e:
             for error in e.errors():
-                issues.append({
-                    "type": "validation_error",
-                    "field": ".".join(str(loc) for loc in error["loc"]),
-                    "description": error["msg"],
-                    "severity": "medium"
-                })
+                issues.append(Issue(
+                    type="validation_error",
+                    field=".".join(str(loc) for loc in error["loc"]),
+                    description=error["msg"],
+                    severity="medium"
+                ))
         except Exception as e:
-            issues.append({
-                "type": "validation_error",
-                "description": f"Unexpected error validating prompt structure: {str(e)}",
-                "severity": "medium"
-            })
+            issues.append(Issue(
+                type="validation_error",
+                description=f"Unexpected error validating prompt structure: {str(e)}",
+                severity="medium"
+            ))
             
         return issues
     
-    def _scan_prompt(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_prompt(self, prompt: Dict[str, Any]) -> Optional[OpenAIPrompt]:
+        """Validate an OpenAI prompt, returning None if it is invalid."""
+        try:
+            return OpenAIPrompt(**prompt)
+        except Exception:
+            return None
+    
+    def _scan_prompt(self, prompt: Union[Dict[str, Any], OpenAIPrompt]) -> List[Dict[str, Any]]:
         """Scan an OpenAI-formatted prompt."""
         issues = []
         
         try:
             # Convert to Pydantic model for easier access
-            validated_prompt = OpenAIPrompt(**prompt)
+            validated_prompt = prompt if isinstance(prompt, OpenAIPrompt) else OpenAIPrompt(**prompt)
             
-            # Scan each message
+            # Collect each message's text, so all of them are evaluated with one LLM call
+            contents = []
             for i, message in enumerate(validated_prompt.messages):
                 # Check if this is a system message
                 is_system_message = message.role == "system"
                 
-                # Check content for injection patterns
-                if isinstance(message.content, str):
-                    self._check_content_for_issues(message.content, i, issues, is_system_message)
-                elif isinstance(message.content, list):
-                    # Handle content parts array (for functions with multiple content parts)
-                    for part in message.content:
-                        if isinstance(part, dict) and part.get("type") == "text":
-                            self._check_content_for_issues(part.get("text", ""), i, issues, is_system_message)
+                contents.extend((text, i, is_system_message) for text in _message_texts(message.content))
+            
+            self._scan_contents(contents, issues)
         except Exception as e:
             # This shouldn't happen as we've already validated the structure
-            issues.append({
-                "type": "processing_error",
-                "description": f"Error processing OpenAI prompt: {str(e)}",
-                "severity": "medium"
-            })
+            issues.append(Issue(
+                type="processing_error",
+                description=f"Error processing OpenAI prompt: {str(e)}",
+                severity="medium"
+            ))
         
         return issues
     
     def _create_evaluation_prompt(self, text: str) -> List[Dict[str, str]]:
         """Create the prompt for OpenAI content evaluation."""
-        categories_info = self._format_categories_for_prompt()
-        examples_info = self._format_examples_for_prompt()
+        policies_info = self._format_policies_for_prompt()
         
         instructions = """
 You are a content safety classifier. Your task is to determine if the user's input
@@ -588,10 +1414,17 @@ If the content violates multiple categories, list them all in the categories arr
 """
         
         return [
-            {"role": "system", "content": instructions + "\n\n" + categories_info + "\n\n" + examples_info},
+            {"role": "system", "content": instructions + "\n\n" + policies_info},
             {"role": "user", "content": f"Input to evaluate: {text}"}
         ]
     
+    def _setup_async_client(self):
+        """Setup async OpenAI client."""
+        if self.base_url:
+            self.async_client = _sdk_class("AsyncOpenAI")(api_key=self.api_key, base_url=self.base_url)
+        else:
+            self.async_client = _sdk_class("AsyncOpenAI")(api_key=self.api_key)
+    
     def _call_content_evaluation(self, prompt, text) -> tuple:
         """Call OpenAI to evaluate content."""
         response = self.client.chat.completions.create(
@@ -600,6 +1433,20 @@ If the content violates multiple categories, list them all in the categories arr
             response_format={"type": "json_object"}
         )
         
+        return self._parse_completion(response)
+    
+    async def _call_content_evaluation_async(self, prompt, text) -> tuple:
+        """Call OpenAI asynchronously to evaluate content."""
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model,
+            messages=prompt,
+            response_format={"type": "json_object"}
+        )
+        
+        return self._parse_completion(response)
+    
+    def _parse_completion(self, response) -> tuple:
+        """Extract the response text and token usage from an OpenAI completion."""
         response_text = response.choices[0].message.content
         token_usage = {
             "prompt_tokens": response.usage.prompt_tokens,
@@ -626,7 +1473,7 @@ class AnthropicPromptScanner(BasePromptScanner):
     
     def _setup_client(self):
         """Setup Anthropic client."""
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = _shared_client(_sdk_class("Anthropic"), api_key=self.api_key)
     
     def _validate_prompt_structure(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Validate Anthropic prompt structure."""
@@ -638,69 +1485,79 @@ class AnthropicPromptScanner(BasePromptScanner):
             elif "prompt" in prompt:
                 OldAnthropicPrompt(**prompt)
             else:
-                issues.append({
-                    "type": "missing_field",
-                    "description": "Missing required field: either 'messages' or 'prompt' must be present",
-                    "severity": "medium"
-                })
+                issues.append(Issue(
+                    type="missing_field",
+                    description="Missing required field: either 'messages' or 'prompt' must be present",
+                    severity="medium"
+                ))
         except ValidationError as e:
             for error in e.errors():
-                issues.append({
-                    "type": "validation_error",
-                    "field": ".".join(str(loc) for loc in error["loc"]),
-                    "description": error["msg"],
-                    "severity": "medium"
-                })
+                issues.append(Issue(
+                    type="validation_error",
+                    field=".".join(str(loc) for loc in error["loc"]),
+                    description=error["msg"],
+                    severity="medium"
+                ))
         except Exception as e:
-            issues.append({
-                "type": "validation_error",
-                "description": f"Unexpected error validating prompt structure: {str(e)}",
-                "severity": "medium"
-            })
+            issues.append(Issue(
+                type="validation_error",
+                description=f"Unexpected error validating prompt structure: {str(e)}",
+                severity="medium"
+            ))
             
         return issues
     
-    def _scan_prompt(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_prompt(self, prompt: Dict[str, Any]) -> Optional[Union[AnthropicPrompt, OldAnthropicPrompt]]:
+        """Validate an Anthropic prompt in either format, returning None if it is invalid."""
+        try:
+            if "messages" in prompt:
+                return AnthropicPrompt(**prompt)
+            if "prompt" in prompt:
+                return OldAnthropicPrompt(**prompt)
+        except Exception:
+            pass
+        return None
+    
+    def _scan_prompt(self, prompt: Union[Dict[str, Any], AnthropicPrompt, OldAnthropicPrompt]) -> List[Dict[str, Any]]:
         """Scan an Anthropic-formatted prompt."""
         issues = []
         
         try:
-            if "messages" in prompt:
+            if isinstance(prompt, dict) and "messages" in prompt:
                 # Convert to Pydantic model for messages format
-                validated_prompt = AnthropicPrompt(**prompt)
+                prompt = AnthropicPrompt(**prompt)
+            
+            if isinstance(prompt, AnthropicPrompt):
+                validated_prompt = prompt
                 
-                # Scan each message
+                # Collect each message's text, so all of them are evaluated with one LLM call
+                contents = []
                 for i, message in enumerate(validated_prompt.messages):
                     # Check if this is a system-like message (Anthropic doesn't have system role)
                     is_system_message = message.role == "assistant" and i == 0
                     
-                    # Check content for injection patterns
-                    if isinstance(message.content, str):
-                        self._check_content_for_issues(message.content, i, issues, is_system_message)
-                    elif isinstance(message.content, list):
-                        # Handle content parts array
-                        for part in message.content:
-                            if isinstance(part, dict) and part.get("type") == "text":
-                                self._check_content_for_issues(part.get("text", ""), i, issues, is_system_message)
-            elif "prompt" in prompt:
+                    contents.extend((text, i, is_system_message) for text in _message_texts(message.content))
+                
+                self._scan_contents(contents, issues)
+            elif isinstance(prompt, OldAnthropicPrompt) or "prompt" in prompt:
                 # Old Anthropic API format (single string)
                 # Here we can't distinguish roles, so we check the entire prompt
-                self._check_content_for_issues(prompt["prompt"], 0, issues)
+                text = prompt.prompt if isinstance(prompt, OldAnthropicPrompt) else prompt["prompt"]
+                self._check_content_for_issues(text, 0, issues)
                 
         except Exception as e:
             # This shouldn't happen as we've already validated the structure
-            issues.append({
-                "type": "processing_error",
-                "description": f"Error processing Anthropic prompt: {str(e)}",
-                "severity": "medium"
-            })
+            issues.append(Issue(
+                type="processing_error",
+                description=f"Error processing Anthropic prompt: {str(e)}",
+                severity="medium"
+            ))
         
         return issues
     
     def _create_evaluation_prompt(self, text: str) -> List[Dict[str, str]]:
         """Create the prompt for Anthropic content evaluation."""
-        categories_info = self._format_categories_for_prompt()
-        examples_info = self._format_examples_for_prompt()
+        policies_info = self._format_policies_for_prompt()
         
         instructions = """
 You are a content safety classifier. Your task is to determine if the user's input
@@ -749,9 +1606,13 @@ If the content violates multiple categories, list them all in the categories arr
 """
         
         return [
-            {"role": "user", "content": f"{instructions}\n\n{categories_info}\n\n{examples_info}\n\nInput to evaluate: {text}\n\nJSON response:"}
+            {"role": "user", "content": f"{instructions}\n\n{policies_info}\n\nInput to evaluate: {text}\n\nJSON response:"}
         ]
     
+    def _setup_async_client(self):
+        """Setup async Anthropic client."""
+        self.async_client = _sdk_class("AsyncAnthropic")(api_key=self.api_key)
+    
     def _call_content_evaluation(self, prompt, text) -> tuple:
         """Call Anthropic to evaluate content."""
         response = self.client.messages.create(
@@ -760,10 +1621,28 @@ If the content violates multiple categories, list them all in the categories arr
             max_tokens=1024
         )
         
+        return self._parse_message(response, text)
+    
+    async def _call_content_evaluation_async(self, prompt, text) -> tuple:
+        """Call Anthropic asynchronously to evaluate content."""
+        response = await self._get_async_client().messages.create(
+            model=self.model,
+            messages=prompt,
+            max_tokens=1024
+        )
+        
+        return self._parse_message(response, text)
+    
+    def _parse_message(self, response, text) -> tuple:
+        """Extract the response text and token usage from an Anthropic message."""
         response_text = response.content[0].text
-        # Anthropic doesn't provide token usage in the same way
-        input_length = self._count_tokens(text)
-        output_length = self._count_tokens(response_text)
+        # Use the token counts Anthropic reports, estimating them if they are missing
+        usage = getattr(response, "usage", None)
+        input_length = getattr(usage, "input_tokens", None)
+        output_length = getattr(usage, "output_tokens", None)
+        if not isinstance(input_length, int) or not isinstance(output_length, int):
+            input_length = self._count_tokens(text)
+            output_length = self._count_tokens(response_text)
         token_usage = {
             "prompt_tokens": input_length,
             "completion_tokens": output_length,
@@ -779,7 +1658,9 @@ class PromptScanner:
     Allows selection of provider-specific implementations.
     """
     
-    def __init__(self, provider: Literal["openai", "anthropic"] = "openai", api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(self, provider: Literal["openai", "anthropic"] = "openai", api_key: Optional[str] = None, model: Optional[str] = None,
+                 semantic_cache: Optional[SemanticCache] = None, result_cache: Optional[ResultCache] = None,
+                 prefilter_max_length: Optional[int] = None, guardrail_fast_reject: bool = False):
         """
         Initialize the PromptScanner with the chosen provider.
         
@@ -787,7 +1668,20 @@ class PromptScanner:
             provider: The LLM provider to use ("openai" or "anthropic")
             api_key: API key for the provider, if None will look in environment variables
             model: Model name to use for content evaluation
+            semantic_cache: Optional SemanticCache used to reuse results for near-duplicate texts
+            result_cache: Optional ResultCache used to reuse results for identical texts. If
+                None and the PROMPT_SCANNER_CACHE_SIZE environment variable is set to a
+                positive integer, a ResultCache holding that many results is created; 0
+                leaves caching off
+            prefilter_max_length: If set, texts shorter than this many characters with no
+                risk keywords are reported safe without an LLM call
+            guardrail_fast_reject: If True, texts passed to scan_text, scan_text_async or
+                scan_text_batch that match a custom guardrail are reported unsafe without an
+                LLM call
         """
+        # Load environment variables from .env file
+        _load_dotenv()
+        
         # Get API key from environment if not provided
         if api_key is None:
             if provider == "openai":
@@ -810,13 +1704,32 @@ class PromptScanner:
         else:
             raise ValueError(f"Unsupported provider: {provider}")
         
+        # Get the result cache size from environment if no cache is provided
+        cache_size = os.environ.get("PROMPT_SCANNER_CACHE_SIZE", "").strip()
+        if result_cache is None and cache_size:
+            try:
+                maxsize = int(cache_size)
+            except ValueError:
+                maxsize = -1
+            if maxsize < 0:
+                raise ValueError(
+                    f"PROMPT_SCANNER_CACHE_SIZE must be a non-negative integer, got {cache_size!r}"
+                )
+            if maxsize > 0:
+                result_cache = ResultCache(maxsize=maxsize)
+        
+        self.scanner.semantic_cache = semantic_cache
+        self.scanner.result_cache = result_cache
+        self.scanner.prefilter_max_length = prefilter_max_length
+        self.scanner.guardrail_fast_reject = guardrail_fast_reject
+        
         # Set up decorator methods
         self.decorators = self._init_decorators()
     
     def _init_decorators(self):
         """Initialize and return decorator functions that use this scanner instance."""
         # Import here to avoid circular imports
-        from .decorators import scan, safe_completion
+        from .decorators import scan, safe_completion, async_safe_completion
         
         class Decorators:
             def __init__(self, scanner_instance):
@@ -829,9 +1742,17 @@ class PromptScanner:
                     prompt_param=prompt_param
                 )
                 
-            def safe_completion(self, prompt_param="prompt"):
+            def safe_completion(self, prompt_param="prompt", scan_together=False):
                 """Decorator to ensure completions are safe."""
                 return safe_completion(
+                    scanner=self.scanner,
+                    prompt_param=prompt_param,
+                    scan_together=scan_together
+                )
+            
+            def async_safe_completion(self, prompt_param="prompt"):
+                """Decorator to ensure completions of coroutine functions are safe."""
+                return async_safe_completion(
                     scanner=self.scanner,
                     prompt_param=prompt_param
                 )
@@ -862,6 +1783,43 @@ class PromptScanner:
         """
         return self.scanner.scan_text(text)
     
+    async def scan_text_async(self, text: str) -> PromptScanResult:
+        """
+        Asynchronously scan text content for unsafe content using LLM-based evaluation.
+        
+        Args:
+            text: The input text to scan
+            
+        Returns:
+            PromptScanResult: Object containing content safety scan results
+        """
+        return await self.scanner.scan_text_async(text)
+    
+    async def scan_texts_async(self, texts: List[str], max_concurrency: int = 5) -> List[PromptScanResult]:
+        """
+        Asynchronously scan many texts, with at most max_concurrency LLM calls in flight.
+        
+        Args:
+            texts: The input texts to scan
+            max_concurrency: Maximum number of evaluations running at once
+            
+        Returns:
+            List[PromptScanResult]: One result per input text, in the same order
+        """
+        return await self.scanner.scan_texts_async(texts, max_concurrency=max_concurrency)
+    
+    def scan_text_batch(self, texts: List[str]) -> List[PromptScanResult]:
+        """
+        Scan several texts for unsafe content with a single LLM call.
+        
+        Args:
+            texts: The input texts to scan
+            
+        Returns:
+            List[PromptScanResult]: One result per input text, in the same order
+        """
+        return self.scanner.scan_text_batch(texts)
+    
     def scan_content(self, text: str) -> PromptScanResult:
         """Alias for scan_text for backward compatibility."""
         return self.scan_text(text)
@@ -0,0 +1,224 @@
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+from prompt_scanner.models import PromptScanResult
+
+
+class SemanticCache:
+    """
+    Cache of text scan results, looked up by exact text first and then by embedding similarity.
+
+    Near-duplicate texts (whitespace, punctuation or light paraphrase changes) reuse the
+    verdict of a previously scanned text instead of paying for another LLM call. A cached
+    verdict is only reused when the cosine similarity is at least `threshold`, so keep it
+    high: a paraphrase can change the meaning of a prompt. Results reused for a
+    near-duplicate rather than the exact text record the similarity in
+    `metadata["semantic_similarity"]`, so callers can tell them apart.
+
+    Embeddings are computed locally with sentence-transformers unless an `embed` callable
+    is given. Both sentence-transformers and numpy are optional dependencies that are only
+    imported on first use. The cache is safe to share between threads; texts are embedded
+    outside its lock.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        model_name: str = "all-MiniLM-L6-v2",
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        capacity: Optional[int] = None
+    ):
+        """
+        Initialize the SemanticCache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached result to be reused
+            model_name: sentence-transformers model used when no `embed` callable is given
+            embed: Optional callable mapping a text to its embedding vector
+            capacity: Maximum number of cached texts, the oldest being replaced first; None for no limit
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.threshold = threshold
+        self.capacity = capacity
+        self.model_name = model_name
+        self._embed = embed
+
+        self._exact: Dict[str, PromptScanResult] = {}
+        self._texts: List[str] = []
+        self._results: List[PromptScanResult] = []
+        # Preallocated (capacity, dim) matrix of unit vectors, grown by doubling
+        self._embeddings = None
+        # Embedding of the last looked-up text, reused by put() after a miss
+        self._last_lookup = None
+        # Slot overwritten by the next put() once the cache is at capacity
+        self._oldest = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _encode(self, text: str):
+        """Embed text as a unit-length float32 vector."""
+        import numpy as np
+
+        embed = self._embed
+        if embed is None:
+            # Held while the model loads so concurrent first lookups load it only once
+            with self._lock:
+                if self._embed is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError:
+                        raise ImportError(
+                            "SemanticCache requires sentence-transformers unless an embed callable is given: "
+                            "pip install sentence-transformers"
+                        )
+                    model = SentenceTransformer(self.model_name)
+                    self._embed = lambda t: model.encode(t, normalize_embeddings=True)
+                embed = self._embed
+
+        vector = np.asarray(embed(text), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, text: str) -> Optional[PromptScanResult]:
+        """
+        Return a copy of the cached result for text or a near-duplicate, or None on a miss.
+
+        Args:
+            text: The text about to be scanned
+        """
+        with self._lock:
+            exact = self._exact.get(text)
+            if exact is not None:
+                return exact.model_copy(deep=True)
+
+        vector = self._encode(text)
+
+        with self._lock:
+            self._last_lookup = (text, vector)
+            if not self._results:
+                return None
+
+            # One matrix-vector product gives the similarity to every cached text
+            similarities = self._embeddings[:len(self._results)] @ vector
+            best = int(similarities.argmax())
+            if similarities[best] < self.threshold:
+                return None
+            result = self._results[best].model_copy(deep=True)
+        result.metadata["semantic_similarity"] = float(similarities[best])
+        return result
+
+    def put(self, text: str, result: PromptScanResult) -> None:
+        """
+        Store the scan result for text.
+
+        Args:
+            text: The scanned text
+            result: The result returned by the LLM evaluation
+        """
+        with self._lock:
+            if text in self._exact:
+                return
+            last_lookup = self._last_lookup
+            self._last_lookup = None
+
+        if last_lookup is not None and last_lookup[0] == text:
+            vector = last_lookup[1]
+        else:
+            vector = self._encode(text)
+
+        with self._lock:
+            if text not in self._exact:
+                self._store(text, vector, result)
+
+    def _store(self, text: str, vector, result: PromptScanResult) -> None:
+        """Add the embedded text and its result; the caller holds the lock."""
+        import numpy as np
+
+        count = len(self._results)
+        if count == self.capacity:
+            # Replace the oldest entry in place, using the rows as a ring buffer
+            slot = self._oldest
+            self._oldest = (slot + 1) % count
+            del self._exact[self._texts[slot]]
+            self._embeddings[slot] = vector
+            self._texts[slot] = text
+            self._results[slot] = result.model_copy(deep=True)
+            self._exact[text] = self._results[slot]
+            return
+
+        if self._embeddings is None:
+            self._embeddings = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif count == self._embeddings.shape[0]:
+            grown = np.empty((count * 2, self._embeddings.shape[1]), dtype=np.float32)
+            grown[:count] = self._embeddings
+            self._embeddings = grown
+
+        self._embeddings[count] = vector
+        self._texts.append(text)
+        self._results.append(result.model_copy(deep=True))
+        self._exact[text] = self._results[-1]
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._exact.clear()
+            self._texts.clear()
+            self._results.clear()
+            self._embeddings = None
+            self._last_lookup = None
+            self._oldest = 0
+
+    def save(self, path: str) -> None:
+        """
+        Persist the cache to a .npz file.
+
+        Args:
+            path: Destination file path, used as given without adding a .npz suffix
+        """
+        import numpy as np
+
+        with self._lock:
+            count = len(self._results)
+            # Save oldest first so that load() can trim to its capacity by dropping the front
+            order = [(self._oldest + i) % count for i in range(count)] if count else []
+            embeddings = self._embeddings[order] if self._embeddings is not None else np.empty((0, 0), dtype=np.float32)
+            texts = [self._texts[i] for i in order]
+            results = [json.dumps(self._results[i].model_dump(mode="json")) for i in order]
+
+        # Writing through a file object stops numpy from appending .npz to the path
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                embeddings=embeddings,
+                texts=np.array(texts, dtype=str),
+                results=np.array(results, dtype=str)
+            )
+
+    def load(self, path: str) -> None:
+        """
+        Replace the cache contents with a cache previously written by save().
+
+        Args:
+            path: Path of the .npz file
+        """
+        import numpy as np
+
+        with np.load(path, allow_pickle=False) as data:
+            embeddings = data["embeddings"].astype(np.float32)
+            texts = [str(t) for t in data["texts"]]
+            results = [PromptScanResult.model_validate(json.loads(str(r))) for r in data["results"]]
+
+        self.clear()
+        if self.capacity is not None and len(texts) > self.capacity:
+            embeddings = embeddings[-self.capacity:]
+            texts = texts[-self.capacity:]
+            results = results[-self.capacity:]
+        if texts:
+            self._embeddings = embeddings
+            self._texts = texts
+            self._results = results
+            self._exact = dict(zip(texts, results))
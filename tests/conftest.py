@@ -0,0 +1,19 @@
+import importlib
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def import_provider_sdks():
+    """
+    Import the provider SDKs before any test runs.
+
+    prompt_scanner.scanner imports an SDK only when the first scanner for its provider
+    creates a client. Several tests patch builtins.open or re.compile in setUp before
+    creating a scanner, and the SDK import needs both, so it has to happen first.
+    """
+    for module in ("openai", "anthropic"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
@@ -3,13 +3,14 @@ import json
 import sys
 import io
 import os
+import subprocess
 import tempfile
 from unittest.mock import patch, MagicMock, mock_open
 import logging
 
 from prompt_scanner import PromptScanResult
 from prompt_scanner.models import CategorySeverity, SeverityLevel, PromptCategory
-from prompt_scanner.cli import main, parse_args, get_input_text, format_result, load_guardrails, setup_api_keys
+from prompt_scanner.cli import main, parse_args, _build_parser, get_input_text, format_result, load_guardrails, setup_api_keys
 import prompt_scanner.cli  # Import the module directly for __main__ test
 
 
@@ -22,6 +23,45 @@ class TestCLI(unittest.TestCase):
             self.assertEqual(args.format, 'text')
             self.assertEqual(args.verbose, 0)  # verbose is now a count
     
+    def test_parse_args_reuses_parser(self):
+        with patch('sys.argv', ['prompt-scanner', '--text', 'first']):
+            first = parse_args()
+        with patch('sys.argv', ['prompt-scanner', '--stdin', '-vv']):
+            second = parse_args()
+        
+        self.assertIs(_build_parser(), _build_parser())
+        self.assertEqual(first.text, 'first')
+        self.assertEqual(first.verbose, 0)
+        self.assertIsNone(second.text)
+        self.assertTrue(second.stdin)
+        self.assertEqual(second.verbose, 2)
+    
+    def test_parse_args_color_only_on_terminal(self):
+        with patch('sys.argv', ['prompt-scanner', '--text', 'test content']):
+            with patch('sys.stdout.isatty', return_value=True):
+                self.assertTrue(parse_args().color)
+            with patch('sys.stdout.isatty', return_value=False):
+                self.assertFalse(parse_args().color)
+        with patch('sys.argv', ['prompt-scanner', '--text', 'test content', '--no-color']):
+            with patch('sys.stdout.isatty', return_value=True):
+                self.assertFalse(parse_args().color)
+    
+    def test_version_does_not_import_scanner(self):
+        code = (
+            "import sys\n"
+            "sys.argv = ['prompt-scanner', '--version']\n"
+            "import prompt_scanner.cli\n"
+            "try:\n"
+            "    prompt_scanner.cli.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('prompt_scanner.scanner' in sys.modules, 'openai' in sys.modules, 'pydantic' in sys.modules)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        
+        self.assertEqual(output.splitlines()[-1], "False False False")
+    
     def test_get_input_text_from_text_arg(self):
         args = MagicMock()
         args.text = "test content"
@@ -41,10 +81,11 @@ class TestCLI(unittest.TestCase):
         args.text = None
         args.file = "test.txt"
         args.stdin = False
+        args.max_input_chars = prompt_scanner.cli.MAX_INPUT_CHARS
         
         result = get_input_text(args)  # Add verbose parameter
         self.assertEqual(result, "test content from file")
-        mock_open.assert_called_once_with("test.txt", 'r')
+        mock_open.assert_called_once_with("test.txt", 'r', buffering=prompt_scanner.cli.INPUT_BUFFER_SIZE)
     
     @patch('sys.stdin')
     def test_get_input_text_from_stdin(self, mock_stdin):
@@ -54,10 +95,41 @@ class TestCLI(unittest.TestCase):
         args.text = None
         args.file = None
         args.stdin = True
+        args.max_input_chars = prompt_scanner.cli.MAX_INPUT_CHARS
         
         result = get_input_text(args)  # Add verbose parameter
         self.assertEqual(result, "test content from stdin")
     
+    @patch('sys.stdin')
+    def test_get_input_text_rejects_oversized_input(self, mock_stdin):
+        mock_stdin.read.return_value = "x" * 11
+        
+        args = MagicMock()
+        args.text = None
+        args.file = None
+        args.stdin = True
+        args.max_input_chars = 10
+        
+        with self.assertRaises(SystemExit) as cm:
+            get_input_text(args)
+        self.assertEqual(cm.exception.code, 1)
+        mock_stdin.read.assert_called_once_with(11)
+    
+    @patch('sys.stdin')
+    def test_max_input_chars_option(self, mock_stdin):
+        with patch('sys.argv', ['prompt-scanner', '--stdin']):
+            self.assertEqual(parse_args().max_input_chars, prompt_scanner.cli.MAX_INPUT_CHARS)
+        
+        # Input over the default limit is accepted once the limit is raised
+        mock_stdin.read.side_effect = lambda size: "x" * min(size, prompt_scanner.cli.MAX_INPUT_CHARS + 5)
+        with patch('sys.argv', ['prompt-scanner', '--stdin', '--max-input-chars', str(prompt_scanner.cli.MAX_INPUT_CHARS + 5)]):
+            args = parse_args()
+        self.assertEqual(len(get_input_text(args)), prompt_scanner.cli.MAX_INPUT_CHARS + 5)
+        
+        with patch('sys.argv', ['prompt-scanner', '--stdin', '--max-input-chars', '0']), \
+                patch('sys.stderr'), self.assertRaises(SystemExit):
+            parse_args()
+    
     # Test format_result function directly
     def test_cli_format_result_safe(self):
         # Create a safe result
@@ -168,6 +240,24 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(json_data["severity_details"]["score"], 0.8)
         self.assertEqual(json_data["severity_details"]["description"], "Content with high risk")
     
+    def test_cli_format_result_json_without_orjson(self):
+        """Test that JSON output is the same with and without orjson."""
+        import prompt_scanner.utils
+        result = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="0", name="Illegal Activity", confidence=0.9),
+            reasoning="Demande d'instructions de piratage \u2014 caf\u00e9",
+            severity=CategorySeverity(level=SeverityLevel.HIGH, score=0.8, description="Content with high risk"),
+            token_usage={"total_tokens": 100}
+        )
+        
+        fast_output = format_result(result, "json", 2, True)
+        with patch.object(prompt_scanner.utils, "orjson", None):
+            fallback_output = format_result(result, "json", 2, True)
+        
+        self.assertEqual(fast_output, fallback_output)
+        self.assertIn("caf\u00e9", fallback_output)
+    
     @patch('prompt_scanner.cli.PromptScanner')
     @patch('prompt_scanner.cli.parse_args')
     @patch('prompt_scanner.cli.get_input_text')
@@ -288,6 +378,15 @@ class TestCLI(unittest.TestCase):
             result = load_guardrails('test_file.json')
             self.assertEqual(result, {"test_guardrail": {"type": "security", "description": "Test description", "patterns": []}})
     
+    def test_load_guardrails_reads_utf8_file(self):
+        guardrails = {"menu_guardrail": {"type": "privacy", "description": "Blocks café menus", "patterns": []}}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "guardrails.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(guardrails, f, ensure_ascii=False)
+            
+            self.assertEqual(load_guardrails(path), guardrails)
+    
     @patch('sys.stderr', new_callable=io.StringIO)
     @patch('sys.exit')
     def test_load_guardrails_invalid_json(self, mock_exit, mock_stderr):
@@ -364,6 +463,7 @@ class TestCLI(unittest.TestCase):
         args.text = None
         args.file = "test.txt"
         args.stdin = False
+        args.max_input_chars = prompt_scanner.cli.MAX_INPUT_CHARS
         
         result = get_input_text(args) 
         self.assertEqual(result, "test content from file")
@@ -384,6 +484,7 @@ class TestCLI(unittest.TestCase):
         args.text = None
         args.file = None
         args.stdin = True
+        args.max_input_chars = prompt_scanner.cli.MAX_INPUT_CHARS
         
         result = get_input_text(args) 
         self.assertEqual(result, "test content from stdin")
@@ -461,15 +562,26 @@ class TestCLI(unittest.TestCase):
         args.anthropic_api_key = "test-anthropic-key"
         args.provider = "openai" # Set a provider to avoid exit
         
-        setup_api_keys(args) 
+        api_key = setup_api_keys(args)
         
-        self.assertEqual(os.environ.get("OPENAI_API_KEY"), "test-openai-key")
-        self.assertEqual(os.environ.get("ANTHROPIC_API_KEY"), "test-anthropic-key")
+        self.assertEqual(api_key, "test-openai-key")
+        # Keys are passed to the scanner, not written to the environment
+        self.assertNotIn("OPENAI_API_KEY", os.environ)
+        self.assertNotIn("ANTHROPIC_API_KEY", os.environ)
         # Check logger.info calls
         self.assertEqual(mock_logger.info.call_count, 2)
         self.assertIn("Using OpenAI API key from command line", mock_logger.info.call_args_list[0][0][0])
         self.assertIn("Using Anthropic API key from command line", mock_logger.info.call_args_list[1][0][0])
 
+    @patch('os.environ', {"ANTHROPIC_API_KEY": "env-anthropic-key"})
+    def test_setup_api_keys_from_environment(self):
+        args = MagicMock()
+        args.openai_api_key = None
+        args.anthropic_api_key = None
+        args.provider = "anthropic"
+        
+        self.assertEqual(setup_api_keys(args), "env-anthropic-key")
+
     @patch('os.environ', {})
     @patch('sys.exit')
     @patch('logging.getLogger')
@@ -664,6 +776,23 @@ class TestCLI(unittest.TestCase):
         # Verify guardrail was added to scanner
         mock_scanner.add_guardrail.assert_called_once_with("custom_rule", guardrails["custom_rule"])
 
+    def test_format_result_severity_colors(self):
+        result = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="harmful_content", name="harmful_content", confidence=0.9),
+            severity=CategorySeverity(level=SeverityLevel.MEDIUM, score=0.5),
+            reasoning="This is unsafe content"
+        )
+        
+        self.assertIn("Severity: \033[93mMEDIUM", format_result(result, "text", 0, True))
+        
+        result.severity.level = SeverityLevel.CRITICAL
+        self.assertIn("Severity: \033[91mCRITICAL", format_result(result, "text", 0, True))
+        
+        result.severity.level = SeverityLevel.LOW
+        self.assertIn("Severity: \033[92mLOW", format_result(result, "text", 0, True))
+        self.assertIn("Severity: LOW", format_result(result, "text", 0, False))
+    
     # Test format_result with no-color option
     def test_format_result_with_no_color(self):
         category = PromptCategory(
@@ -1,8 +1,10 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import sys
 import os
 import inspect
+import threading
 
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,7 +15,7 @@ sys.modules['anthropic'] = MagicMock()
 sys.modules['yaml'] = MagicMock()
 
 # Now import the package
-from prompt_scanner.decorators import scan, safe_completion
+from prompt_scanner.decorators import scan, safe_completion, async_safe_completion
 
 # Create a mocked ScanResult class for testing
 class ScanResult:
@@ -162,6 +164,21 @@ class TestDecorators(unittest.TestCase):
         # Verify result is from the function
         self.assertEqual(result, "function_result")
 
+    def test_scan_decorator_inspects_signature_once(self):
+        """Test that the prompt position is resolved once and reused across calls."""
+        def test_function(arg1, prompt):
+            return "function_result"
+        
+        decorated_func = scan(scanner=self.mock_scanner, prompt_param="prompt")(test_function)
+        
+        with patch('inspect.signature', wraps=inspect.signature) as mock_signature:
+            for i in range(3):
+                decorated_func("arg1_value", f"safe prompt {i}")
+        
+        mock_signature.assert_called_once()
+        self.assertEqual(self.mock_scanner.scan_text.call_count, 3)
+        self.mock_scanner.scan_text.assert_called_with("safe prompt 2")
+
     def test_scan_decorator_with_no_prompt(self):
         """Test that scan decorator calls function when no prompt is provided."""
         # Create mock function
@@ -183,6 +200,17 @@ class TestDecorators(unittest.TestCase):
         # Verify result is from the function
         self.assertEqual(result, "function_result")
 
+    def test_scan_decorator_skips_blank_prompt(self):
+        """Test that whitespace-only prompts are passed through without a scan."""
+        mock_func = MagicMock(return_value="function_result")
+        decorated_func = scan(scanner=self.mock_scanner)(mock_func)
+        
+        result = decorated_func(prompt="  \n\t ")
+        
+        self.mock_scanner.scan_text.assert_not_called()
+        self.mock_scanner.scan.assert_not_called()
+        self.assertEqual(result, "function_result")
+    
     def test_scan_decorator_no_scanner_provided(self):
         """Test that scan decorator raises error when no scanner is provided."""
         # Create mock function
@@ -445,6 +473,136 @@ class TestDecorators(unittest.TestCase):
         # Verify result is the expected response from the function
         self.assertEqual(result, "mock function response")
 
+    def test_safe_completion_scan_together_uses_one_batch_call(self):
+        """Test that scan_together scans the prompt and response with one batch call."""
+        self.mock_scanner.scan_text_batch.return_value = [self.safe_result, self.safe_result]
+        mock_func = MagicMock(return_value="safe output text")
+        decorated_func = safe_completion(scanner=self.mock_scanner, scan_together=True)(mock_func)
+        
+        result = decorated_func(prompt="safe prompt text")
+        
+        self.mock_scanner.scan_text_batch.assert_called_once_with(["safe prompt text", "safe output text"])
+        self.mock_scanner.scan_text.assert_not_called()
+        self.assertEqual(result, "safe output text")
+
+    def test_safe_completion_scan_together_reports_unsafe_input_first(self):
+        """Test that scan_together returns the input result when both texts are unsafe."""
+        unsafe_output = ScanResult(is_safe=False, issues=[{"type": "output_issue"}])
+        self.mock_scanner.scan_text_batch.return_value = [self.unsafe_result, unsafe_output]
+        mock_func = MagicMock(return_value="unsafe output text")
+        decorated_func = safe_completion(scanner=self.mock_scanner, scan_together=True)(mock_func)
+        
+        result = decorated_func(prompt="unsafe prompt text")
+        
+        mock_func.assert_called_once()
+        self.assertEqual(result, self.unsafe_result)
+
+    def test_async_safe_completion_with_safe_content(self):
+        """Test that async_safe_completion returns the response when input and output are safe."""
+        self.mock_scanner.scan_text_async = AsyncMock(return_value=self.safe_result)
+        
+        @async_safe_completion(scanner=self.mock_scanner)
+        async def complete(prompt):
+            return "completion for " + prompt
+        
+        result = asyncio.run(complete("safe prompt"))
+        
+        self.assertEqual(result, "completion for safe prompt")
+        self.assertEqual(
+            [call.args[0] for call in self.mock_scanner.scan_text_async.call_args_list],
+            ["safe prompt", "completion for safe prompt"]
+        )
+
+    def test_async_safe_completion_cancels_on_unsafe_input(self):
+        """Test that the running completion is cancelled when the input is unsafe."""
+        cancelled = []
+        
+        async def scan_text_async(text):
+            # Let the completion start before the verdict arrives
+            await asyncio.sleep(0)
+            return self.unsafe_result
+        
+        self.mock_scanner.scan_text_async = scan_text_async
+        
+        @async_safe_completion(scanner=self.mock_scanner, prompt_param="question")
+        async def complete(question):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(question)
+                raise
+            return "never returned"
+        
+        result = asyncio.run(complete(question="unsafe prompt"))
+        
+        self.assertIs(result, self.unsafe_result)
+        self.assertEqual(cancelled, ["unsafe prompt"])
+
+    def test_async_safe_completion_waits_for_cancelled_completion(self):
+        """Test that the cancelled completion has finished by the time the result is returned."""
+        finished = []
+        
+        async def scan_text_async(text):
+            await asyncio.sleep(0)
+            return self.unsafe_result
+        
+        self.mock_scanner.scan_text_async = scan_text_async
+        
+        @async_safe_completion(scanner=self.mock_scanner)
+        async def complete(prompt):
+            try:
+                await asyncio.sleep(10)
+            finally:
+                finished.append(prompt)
+        
+        async def run():
+            result = await complete("unsafe prompt")
+            return result, list(finished)
+        
+        result, finished_before_return = asyncio.run(run())
+        
+        self.assertIs(result, self.unsafe_result)
+        self.assertEqual(finished_before_return, ["unsafe prompt"])
+
+    def test_async_safe_completion_scans_dict_prompt_off_the_loop(self):
+        """Test that a dictionary prompt is scanned while the completion runs."""
+        started = threading.Event()
+        
+        def scan(prompt):
+            # Only safe if the completion got to run while the input was being scanned
+            return self.safe_result if started.wait(timeout=2) else self.unsafe_result
+        
+        self.mock_scanner.scan.side_effect = scan
+        self.mock_scanner.scan_text_async = AsyncMock(return_value=self.safe_result)
+        
+        @async_safe_completion(scanner=self.mock_scanner)
+        async def complete(prompt):
+            started.set()
+            return "completion"
+        
+        result = asyncio.run(complete({"messages": [{"role": "user", "content": "Hello"}]}))
+        
+        self.assertEqual(result, "completion")
+
+    def test_async_safe_completion_with_unsafe_output(self):
+        """Test that async_safe_completion returns the output scan result when the output is unsafe."""
+        self.mock_scanner.scan_text_async = AsyncMock(side_effect=[self.safe_result, self.unsafe_result])
+        
+        @async_safe_completion(scanner=self.mock_scanner)
+        async def complete(prompt):
+            return "unsafe completion"
+        
+        self.assertIs(asyncio.run(complete("safe prompt")), self.unsafe_result)
+
+    def test_async_safe_completion_without_scanner(self):
+        """Test that async_safe_completion raises when no scanner is provided."""
+        @async_safe_completion()
+        async def complete(prompt):
+            return "completion"
+        
+        with self.assertRaises(ValueError):
+            asyncio.run(complete("prompt"))
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import unittest
@@ -8,7 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from prompt_scanner.models import (
     Message, OpenAIPrompt, AnthropicPrompt, AnthropicMessage, OldAnthropicPrompt,
     PromptCategory, CategorySeverity, PromptScanResult, CustomGuardrail, CustomCategory,
-    SeverityLevel
+    SeverityLevel, Issue, filter_by_min_severity, rank_by_severity
 )
 
 class TestModels(unittest.TestCase):
@@ -129,6 +130,70 @@ class TestModels(unittest.TestCase):
         # Test type
         self.assertIsInstance(SeverityLevel.LOW, SeverityLevel)
         self.assertIsInstance(SeverityLevel.LOW.value, str)
+
+    def test_severity_level_ordering(self):
+        """Test that SeverityLevel compares by severity."""
+        self.assertLess(SeverityLevel.LOW, SeverityLevel.MEDIUM)
+        self.assertLess(SeverityLevel.MEDIUM, SeverityLevel.HIGH)
+        self.assertLess(SeverityLevel.HIGH, SeverityLevel.CRITICAL)
+        self.assertGreaterEqual(SeverityLevel.HIGH, SeverityLevel.HIGH)
+        self.assertFalse(SeverityLevel.CRITICAL < SeverityLevel.LOW)
+        self.assertEqual(max(SeverityLevel), SeverityLevel.CRITICAL)
+        self.assertEqual([level.rank for level in SeverityLevel], [0, 1, 2, 3])
+        
+        # Values are still the upper-case strings, and lower-case names are accepted
+        self.assertEqual(SeverityLevel.HIGH, "HIGH")
+        self.assertEqual(SeverityLevel("high"), SeverityLevel.HIGH)
+        with self.assertRaises(ValueError):
+            SeverityLevel("extreme")
+        
+        # Level names compare by severity too, in either case and on either side
+        self.assertTrue("low" < SeverityLevel.HIGH)
+        self.assertTrue(SeverityLevel.CRITICAL > "medium")
+        self.assertTrue(SeverityLevel.MEDIUM >= "MEDIUM")
+        self.assertFalse("critical" <= SeverityLevel.LOW)
+    
+    def test_filter_by_min_severity(self):
+        """Test filtering issues by a minimum severity."""
+        issues = [
+            Issue(type="a", severity="medium"),
+            Issue(type="b", severity="high"),
+            Issue(type="c"),
+            {"type": "d", "severity": SeverityLevel.CRITICAL},
+            Issue(type="e", severity="low")
+        ]
+        high = filter_by_min_severity(issues, SeverityLevel.HIGH)
+        self.assertEqual([issue["type"] for issue in high], ["b", "d"])
+        
+        medium = filter_by_min_severity(issues, "medium")
+        self.assertEqual([issue["type"] for issue in medium], ["a", "b", "d"])
+        
+        self.assertEqual(filter_by_min_severity([], SeverityLevel.LOW), [])
+    
+    def test_rank_by_severity(self):
+        """Test ordering scan results by severity level and score."""
+        def make(name, level=None, score=0.0):
+            severity = CategorySeverity(level=level, score=score) if level else None
+            return PromptScanResult(is_safe=level is None, reasoning=name, severity=severity)
+        
+        results = [
+            make("medium", SeverityLevel.MEDIUM, 0.9),
+            make("safe"),
+            make("critical", SeverityLevel.CRITICAL, 0.2),
+            make("high-low-score", SeverityLevel.HIGH, 0.3),
+            make("high", SeverityLevel.HIGH, 0.8),
+            make("high-tie", SeverityLevel.HIGH, 0.8)
+        ]
+        ranked = rank_by_severity(results)
+        self.assertEqual(
+            [r.reasoning for r in ranked],
+            ["critical", "high", "high-tie", "high-low-score", "medium", "safe"]
+        )
+        
+        at_least_high = rank_by_severity(results, min_level="high")
+        self.assertEqual([r.reasoning for r in at_least_high], ["critical", "high", "high-tie", "high-low-score"])
+        
+        self.assertEqual(rank_by_severity([]), [])
     
     def test_category_severity(self):
         """Test the CategorySeverity model."""
@@ -264,6 +329,11 @@ class TestModels(unittest.TestCase):
         result_dict = result.to_dict()
         self.assertIn("all_categories", result_dict)
         self.assertEqual(len(result_dict["all_categories"]), 3)
+        
+        # Test to_json serializes the same dictionary
+        self.assertEqual(json.loads(result.to_json()), result_dict)
+        self.assertNotIn("\n", result.to_json())
+        self.assertIn("\n", result.to_json(indent=True))
     
     def test_prompt_scan_result_str_line_coverage(self):
         """Specific test to ensure coverage of line 82 in models.py."""
@@ -424,6 +494,28 @@ class TestModels(unittest.TestCase):
         )
         self.assertEqual(len(category_with_examples.examples), 2)
 
+    def test_issue_model(self):
+        """Test the Issue model."""
+        issue = Issue(
+            type="potential_injection",
+            description="Potential prompt injection",
+            pattern="model_confusion",
+            message_index=0
+        )
+        # Attribute access
+        self.assertEqual(issue.type, "potential_injection")
+        self.assertEqual(issue.pattern, "model_confusion")
+        self.assertEqual(issue.message_index, 0)
+        self.assertEqual(issue.severity, "unknown")
+        self.assertFalse(issue.custom)
+        self.assertIsNone(issue.guardrail)
+
+        # Still a plain dictionary
+        self.assertEqual(issue["type"], "potential_injection")
+        self.assertEqual(issue.get("severity", "low"), "low")
+        self.assertEqual(json.loads(json.dumps(issue)), issue._asdict())
+        self.assertIs(type(issue._asdict()), dict)
+
     def test_prompt_scan_result_methods(self):
         """Test additional PromptScanResult methods."""
         # Test get_secondary_categories with no additional categories
@@ -461,6 +553,37 @@ class TestModels(unittest.TestCase):
         self.assertEqual(len(top_categories), 2)
         self.assertEqual(top_categories[0]["id"], "primary")
         self.assertEqual(top_categories[1]["id"], "secondary")
+        
+        # Ties keep their original order, like a stable sort
+        result_with_ties = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="a", name="A", confidence=0.5),
+            all_categories=[
+                {"id": "a", "name": "A", "confidence": 0.5},
+                {"id": "b", "name": "B", "confidence": 0.9},
+                {"id": "c", "name": "C", "confidence": 0.5},
+                {"id": "d", "name": "D"}
+            ]
+        )
+        self.assertEqual(
+            [c["id"] for c in result_with_ties.get_highest_risk_categories(max_count=3)],
+            ["b", "a", "c"]
+        )
+        
+        # Test category_confidences
+        self.assertEqual(
+            result_with_secondary.category_confidences(),
+            [("Primary Category", 0.9), ("Secondary Category", 0.7), ("Tertiary Category", 0.5)]
+        )
+        self.assertEqual(result_no_categories.category_confidences(), [])
+        
+        # Test categories_above
+        self.assertEqual(
+            [category["name"] for category in result_with_secondary.categories_above(0.7)],
+            ["Primary Category", "Secondary Category"]
+        )
+        self.assertEqual(result_with_secondary.categories_above(0.95), [])
+        self.assertEqual(result_no_categories.categories_above(0.0), [])
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
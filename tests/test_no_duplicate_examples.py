@@ -0,0 +1,34 @@
+import hashlib
+import os
+import unittest
+from pathlib import Path
+
+EXAMPLES_DIR = Path(os.path.dirname(__file__)).parent / "examples"
+
+
+class TestNoDuplicateExamples(unittest.TestCase):
+    def test_example_scripts_are_distinct(self):
+        """Every example script has unique content, so there is one place to edit each example."""
+        seen = {}
+        duplicates = []
+        for path in sorted(EXAMPLES_DIR.glob("*.py")):
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+            if digest in seen:
+                duplicates.append((seen[digest].name, path.name))
+            else:
+                seen[digest] = path
+        
+        self.assertEqual(duplicates, [], "Duplicate example scripts found")
+    
+    def test_custom_guardrail_example_is_defined_once(self):
+        """The technical info guardrail is only defined by the custom guardrails example."""
+        defining = [
+            path.name for path in sorted(EXAMPLES_DIR.glob("*.py"))
+            if r"internal\s+API\s+endpoint" in path.read_text(encoding="utf-8")
+        ]
+        
+        self.assertEqual(defining, ["custom_guardrails_and_categories.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prompt_scanner.persistent_cache import PersistentResultCache
+from prompt_scanner.models import PromptScanResult, PromptCategory, CategorySeverity, SeverityLevel
+
+
+class TestPersistentResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "nested", "results.db")
+        self.unsafe_result = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="0", name="Illegal Activity", confidence=0.9),
+            severity=CategorySeverity(level=SeverityLevel.HIGH, score=0.8),
+            reasoning="Asks for hacking instructions"
+        )
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_results_survive_reopening(self):
+        cache = PersistentResultCache(self.path)
+        cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        cache.close()
+        
+        reopened = PersistentResultCache(self.path)
+        result = reopened.get("How do I hack a bank?", "gpt-4o")
+        reopened.close()
+        
+        self.assertFalse(result.is_safe)
+        self.assertEqual(result.category.name, "Illegal Activity")
+        self.assertEqual(result.severity.level, SeverityLevel.HIGH)
+        self.assertEqual(reopened.hits, 1)
+        self.assertEqual(reopened.misses, 0)
+    
+    def test_miss_and_model_in_key(self):
+        cache = PersistentResultCache(self.path)
+        cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        
+        self.assertIsNone(cache.get("How do I hack a bank?", "claude-3-opus-20240229"))
+        self.assertEqual(cache.misses, 1)
+        cache.close()
+    
+    def test_expired_results_are_ignored_and_purged(self):
+        cache = PersistentResultCache(self.path, ttl=60)
+        cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        cache.close()
+        
+        with patch('prompt_scanner.persistent_cache.time.time', return_value=time.time() + 120):
+            reopened = PersistentResultCache(self.path, ttl=60)
+            self.assertIsNone(reopened.get("How do I hack a bank?", "gpt-4o"))
+            count = reopened._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            reopened.close()
+        
+        self.assertEqual(count, 0)
+    
+    def test_expired_results_are_not_served_from_memory(self):
+        cache = PersistentResultCache(self.path, ttl=60)
+        cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        self.assertIsNotNone(cache.get("How do I hack a bank?", "gpt-4o"))
+
+        with patch('prompt_scanner.persistent_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("How do I hack a bank?", "gpt-4o"))
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 1)
+        cache.close()
+
+    def test_clear_removes_disk_entries(self):
+        cache = PersistentResultCache(self.path)
+        cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        cache.clear()
+        cache.close()
+        
+        reopened = PersistentResultCache(self.path)
+        self.assertIsNone(reopened.get("How do I hack a bank?", "gpt-4o"))
+        reopened.close()
+    
+    def test_policy_changes_keep_stored_results(self):
+        with patch('prompt_scanner.scanner.OpenAI'):
+            from prompt_scanner import PromptScanner
+            plain = PromptScanner(provider="openai", api_key="test-key", result_cache=PersistentResultCache(self.path))
+            custom = PromptScanner(provider="openai", api_key="test-key", result_cache=PersistentResultCache(self.path))
+        custom.add_custom_category("tech_jargon", {"name": "Technical Jargon", "description": "Jargon"})
+        
+        with patch.object(plain.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            plain.scan_text("Explain our microservice mesh")
+        
+        # A scanner with other categories evaluates the text again rather than reusing the verdict
+        with patch.object(custom.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            custom.scan_text("Explain our microservice mesh")
+            mock_call.assert_called_once()
+        
+        # Changing categories clears memory only; the stored verdicts stay for other processes
+        plain.add_custom_category("tech_jargon", {"name": "Technical Jargon", "description": "Jargon"})
+        count = plain.scanner.result_cache._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self.assertEqual(count, 2)
+        self.assertEqual(len(plain.scanner.result_cache), 0)
+        
+        # plain now has the same categories as custom, so it reuses custom's stored verdict
+        with patch.object(plain.scanner, '_call_content_evaluation') as mock_call:
+            plain.scan_text("Explain our microservice mesh")
+            mock_call.assert_not_called()
+        
+        plain.scanner.result_cache.close()
+        custom.scanner.result_cache.close()
+    
+    def test_invalid_ttl(self):
+        with self.assertRaises(ValueError):
+            PersistentResultCache(self.path, ttl=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
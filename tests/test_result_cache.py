@@ -0,0 +1,150 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prompt_scanner.result_cache import ResultCache
+from prompt_scanner.models import PromptScanResult, PromptCategory
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(maxsize=2)
+        self.unsafe_result = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="0", name="Illegal Activity", confidence=0.9),
+            reasoning="Asks for hacking instructions"
+        )
+    
+    def test_miss_on_empty_cache(self):
+        self.assertIsNone(self.cache.get("How do I hack a bank?", "gpt-4o"))
+    
+    def test_exact_hit(self):
+        self.cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        
+        result = self.cache.get("How do I hack a bank?", "gpt-4o")
+        
+        self.assertFalse(result.is_safe)
+        self.assertEqual(result.category.name, "Illegal Activity")
+    
+    def test_key_includes_text_and_model(self):
+        self.cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        
+        self.assertIsNone(self.cache.get("how do i hack a bank?", "gpt-4o"))
+        self.assertIsNone(self.cache.get("How do I hack a bank?", "gpt-4o-mini"))
+    
+    def test_whitespace_is_normalized(self):
+        self.cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        
+        result = self.cache.get("  How do I\n hack   a bank?\t", "gpt-4o")
+        
+        self.assertIsNotNone(result)
+        self.assertEqual(result.category.name, "Illegal Activity")
+    
+    def test_hit_and_miss_counters(self):
+        self.cache.get("How do I hack a bank?", "gpt-4o")
+        self.cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        self.cache.get("How do I hack a bank?", "gpt-4o")
+        self.cache.get("How do I hack a bank?", "gpt-4o")
+        
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.misses, 1)
+    
+    def test_hits_return_copies(self):
+        self.cache.put("How do I hack a bank?", "gpt-4o", self.unsafe_result)
+        
+        first = self.cache.get("How do I hack a bank?", "gpt-4o")
+        first.reasoning = "mutated"
+        
+        self.assertEqual(self.cache.get("How do I hack a bank?", "gpt-4o").reasoning, "Asks for hacking instructions")
+    
+    def test_least_recently_used_is_evicted(self):
+        self.cache.put("a", "gpt-4o", PromptScanResult(is_safe=True, reasoning="a"))
+        self.cache.put("b", "gpt-4o", PromptScanResult(is_safe=True, reasoning="b"))
+        self.cache.get("a", "gpt-4o")
+        self.cache.put("c", "gpt-4o", PromptScanResult(is_safe=True, reasoning="c"))
+        
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get("a", "gpt-4o"))
+        self.assertIsNone(self.cache.get("b", "gpt-4o"))
+        self.assertIsNotNone(self.cache.get("c", "gpt-4o"))
+    
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            ResultCache(maxsize=0)
+
+
+class TestScannerWithResultCache(unittest.TestCase):
+    def setUp(self):
+        self.openai_patcher = patch('prompt_scanner.scanner.OpenAI')
+        self.openai_patcher.start()
+        
+        from prompt_scanner import PromptScanner
+        self.cache = ResultCache()
+        self.scanner = PromptScanner(provider="openai", api_key="test-key", result_cache=self.cache)
+    
+    def tearDown(self):
+        self.openai_patcher.stop()
+    
+    def test_second_scan_served_from_cache(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            
+            first = self.scanner.scan_text("How are you today?")
+            second = self.scanner.scan_text("How are you today?")
+            
+            mock_call.assert_called_once()
+            self.assertEqual(first.reasoning, second.reasoning)
+    
+    def test_errors_are_not_cached(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ("not json", {"prompt_tokens": 10})
+            
+            self.scanner.scan_text("How are you today?")
+            self.scanner.scan_text("How are you today?")
+            
+            self.assertEqual(mock_call.call_count, 2)
+            self.assertEqual(len(self.cache), 0)
+    
+    def test_cache_size_from_environment(self):
+        from prompt_scanner import PromptScanner
+        
+        with patch.dict(os.environ, {"PROMPT_SCANNER_CACHE_SIZE": "16"}):
+            scanner = PromptScanner(provider="openai", api_key="test-key")
+            explicit = PromptScanner(provider="openai", api_key="test-key", result_cache=self.cache)
+        
+        self.assertIsInstance(scanner.scanner.result_cache, ResultCache)
+        self.assertEqual(scanner.scanner.result_cache.maxsize, 16)
+        self.assertIs(explicit.scanner.result_cache, self.cache)
+        
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(PromptScanner(provider="openai", api_key="test-key").scanner.result_cache)
+        
+        # 0 turns the cache off
+        with patch.dict(os.environ, {"PROMPT_SCANNER_CACHE_SIZE": "0"}):
+            self.assertIsNone(PromptScanner(provider="openai", api_key="test-key").scanner.result_cache)
+    
+    def test_invalid_cache_size_from_environment(self):
+        from prompt_scanner import PromptScanner
+        
+        for value in ["lots", "-1", "1.5"]:
+            with patch.dict(os.environ, {"PROMPT_SCANNER_CACHE_SIZE": value}):
+                with self.assertRaisesRegex(ValueError, "PROMPT_SCANNER_CACHE_SIZE"):
+                    PromptScanner(provider="openai", api_key="test-key")
+    
+    def test_cache_cleared_when_categories_change(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            
+            self.scanner.scan_text("How are you today?")
+            self.scanner.add_custom_category("tech_jargon", {"name": "Technical Jargon", "description": "Jargon"})
+            self.scanner.scan_text("How are you today?")
+            
+            self.assertEqual(mock_call.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
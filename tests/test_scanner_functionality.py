@@ -3,14 +3,18 @@ import sys
 import unittest
 from unittest.mock import patch, mock_open, MagicMock, PropertyMock
 import re
+import asyncio
 
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from prompt_scanner import PromptScanner
-from prompt_scanner.scanner import BasePromptScanner, OpenAIPromptScanner, AnthropicPromptScanner, ScanResult
+from prompt_scanner.scanner import BasePromptScanner, OpenAIPromptScanner, AnthropicPromptScanner, ScanResult, _required_literals, _is_combinable
 from prompt_scanner.models import PromptScanResult, PromptCategory
 
+# Kept before setUp patches re.compile, for tests that need real regexes
+REAL_RE_COMPILE = re.compile
+
 
 class MockBaseScanner(BasePromptScanner):
     """Mock implementation of BasePromptScanner for testing abstract methods"""
@@ -199,6 +203,14 @@ class TestScannerFunctionality(unittest.TestCase):
                 if "regex" in pattern:
                     self.mock_re_compile.assert_any_call(pattern["regex"], 2)  # IGNORECASE=2
     
+    def test_compile_patterns_compiles_guardrail_regexes(self):
+        """Test that built-in guardrail regexes are compiled once up front."""
+        self.scanner._compile_patterns()
+        
+        pattern = self.guardrails["data_privacy"]["patterns"][0]
+        self.assertIn("compiled_regex", pattern)
+        self.mock_re_compile.assert_any_call(pattern["value"], re.IGNORECASE)
+    
     def test_count_tokens(self):
         """Test the token counting approximation."""
         # Test with short text
@@ -236,6 +248,162 @@ class TestScannerFunctionality(unittest.TestCase):
         pattern_empty = {}
         self.assertFalse(self.scanner._check_pattern("Test content", pattern_empty))
     
+    def test_required_literals(self):
+        """Test extraction of literals required by a regex."""
+        self.assertEqual(
+            _required_literals(r"(AWS|Azure|GCP)\s+(access|secret)\s+key"),
+            ["access", "secret"]
+        )
+        self.assertEqual(
+            _required_literals("ignore previous instructions|Disregard your instructions"),
+            ["ignore previous instructions", "disregard your instructions"]
+        )
+        # No literal can be guaranteed, so the regex must always run
+        self.assertIsNone(_required_literals(r"\b\d{16}\b"))
+        self.assertIsNone(_required_literals("foo|"))
+        self.assertIsNone(_required_literals("[invalid(regex"))
+    
+    def test_is_combinable(self):
+        """Test detection of regexes that can share an alternation."""
+        self.assertTrue(_is_combinable(r"(AWS|Azure|GCP)\s+(access|secret)\s+key"))
+        self.assertTrue(_is_combinable(r"\b\d{16}\b"))
+        # Backreferences, lookarounds, named groups and global flags are kept apart
+        self.assertFalse(_is_combinable(r"(\w+) \1"))
+        self.assertFalse(_is_combinable(r"(?<!system message: )you are a"))
+        self.assertFalse(_is_combinable(r"(?:secret(?=\s+key))+"))
+        self.assertFalse(_is_combinable(r"(?P<word>\w+)"))
+        self.assertFalse(_is_combinable(r"(?i)internal api"))
+        self.assertFalse(_is_combinable("[invalid(regex"))
+    
+    def test_regex_analysis_caches_are_bounded(self):
+        """Test that regexes from guardrails churned at runtime don't grow the analysis caches forever."""
+        for i in range(1100):
+            _required_literals(rf"ticket\s+{i}")
+            _is_combinable(rf"ticket\s+{i}")
+        
+        self.assertLessEqual(_required_literals.cache_info().currsize, 1024)
+        self.assertLessEqual(_is_combinable.cache_info().currsize, 1024)
+    
+    def test_guardrail_combined_regex(self):
+        """Test that a guardrail's combinable patterns are checked in one pass."""
+        guardrail = {
+            "type": "privacy",
+            "patterns": [
+                {"type": "regex", "value": r"upcoming\s+product\s+release"},
+                {"type": "regex", "value": r"unannounced\s+feature"},
+                {"type": "regex", "value": r"(?<!no )secret\s+key"}
+            ]
+        }
+        
+        with patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.scanner._compile_guardrail_patterns(guardrail)
+        
+        self.assertIn("combined_regex", guardrail)
+        self.assertEqual([p["combinable"] for p in guardrail["patterns"]], [True, True, False])
+        
+        self.assertFalse(self.scanner._check_guardrail("Our UNANNOUNCED feature ships soon", guardrail))
+        self.assertFalse(self.scanner._check_guardrail("Here is the secret key", guardrail))
+        self.assertTrue(self.scanner._check_guardrail("There is no secret key here", guardrail))
+        self.assertTrue(self.scanner._check_guardrail("Nothing to see", guardrail))
+    
+    def test_custom_guardrails_combined_regex(self):
+        """Test that custom privacy guardrails are decided by one combined regex pass."""
+        self.scanner.guardrails = {}
+        with patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.scanner.add_custom_guardrail("secrets", {
+                "type": "privacy",
+                "description": "Secrets",
+                "patterns": [{"type": "regex", "value": r"secret\s+key"}]
+            })
+            self.scanner.add_custom_guardrail("rotation", {
+                "type": "privacy",
+                "description": "Rotation",
+                "patterns": [{"type": "regex", "value": r"key\s+rotation"}]
+            })
+            self.scanner.add_custom_guardrail("lookaround", {
+                "type": "privacy",
+                "description": "Lookaround",
+                "patterns": [{"type": "regex", "value": r"(?<!no )password"}]
+            })
+        
+        self.assertEqual(set(self.scanner._combined_custom.covered), {"secrets", "rotation"})
+        
+        def violations(content):
+            issues = []
+            with patch.object(self.scanner, 'scan_text', return_value=PromptScanResult(is_safe=True)):
+                self.scanner._check_content_for_issues(content, 0, issues)
+            return [issue["guardrail"] for issue in issues if issue["type"] == "guardrail_violation"]
+        
+        with patch.object(self.scanner, '_check_guardrail', wraps=self.scanner._check_guardrail) as mock_check_guardrail:
+            self.assertEqual(violations("Nothing sensitive here"), [])
+            # Only the guardrail that can't be combined is checked on its own
+            checked = [c[0][1] for c in mock_check_guardrail.call_args_list]
+            self.assertEqual(checked, [self.scanner.custom_guardrails["lookaround"]])
+        
+        self.assertEqual(violations("my SECRET key"), ["secrets"])
+        self.assertEqual(violations("the password is"), ["lookaround"])
+        # Overlapping matches are still attributed to both guardrails
+        self.assertEqual(violations("secret key rotation"), ["secrets", "rotation"])
+        
+        with patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.scanner.remove_custom_guardrail("secrets")
+        self.assertEqual(violations("secret key rotation"), ["rotation"])
+    
+    def test_custom_guardrail_patterns_changed_in_place(self):
+        """Test that patterns appended to a registered guardrail are not ignored by the combined regex."""
+        self.scanner.guardrails = {}
+        guardrail = {
+            "type": "privacy",
+            "description": "Secrets",
+            "patterns": [{"type": "regex", "value": r"secret\s+key"}]
+        }
+        with patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.scanner.add_custom_guardrail("secrets", guardrail)
+            guardrail["patterns"].append({"type": "regex", "value": r"api\s+token"})
+            
+            self.assertEqual(self.scanner._violated_custom_guardrails("my api token", "my api token"), ["secrets"])
+            self.assertEqual(self.scanner._violated_custom_guardrails("my secret key", "my secret key"), ["secrets"])
+            self.assertEqual(self.scanner._violated_custom_guardrails("nothing here", "nothing here"), [])
+    
+    def test_custom_guardrail_patterns_prefer_re2(self):
+        """Test that custom guardrail regexes use RE2 when installed, falling back to re."""
+        def compile_re2(pattern):
+            if "(?<" in pattern:
+                raise ValueError("RE2 does not support lookbehind")
+            return REAL_RE_COMPILE(pattern)
+        
+        fake_re2 = MagicMock()
+        fake_re2.compile.side_effect = compile_re2
+        guardrail = {
+            "type": "privacy",
+            "patterns": [
+                {"type": "regex", "value": r"upcoming\s+product\s+release"},
+                {"type": "regex", "value": r"(?<!no )secret\s+key"}
+            ]
+        }
+        
+        with patch('prompt_scanner.scanner.re2', fake_re2), patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.scanner.add_custom_guardrail("product_info", guardrail)
+        
+        self.assertEqual([p["engine"] for p in guardrail["patterns"]], ["re2", "re"])
+        fake_re2.compile.assert_any_call(r"(?i)upcoming\s+product\s+release")
+        self.assertFalse(self.scanner._check_guardrail("The UPCOMING product release", guardrail))
+        self.assertFalse(self.scanner._check_guardrail("Here is the secret key", guardrail))
+        self.assertTrue(self.scanner._check_guardrail("There is no secret key", guardrail))
+    
+    def test_check_content_skips_patterns_without_required_literals(self):
+        """Test that regexes whose required literals are absent are never run."""
+        self.scanner.injection_patterns["system_role_impersonation"]["literal_hints"] = ["ignore previous instructions"]
+        issues = []
+        
+        with patch.object(self.scanner, 'scan_text', return_value=PromptScanResult(is_safe=True)):
+            with patch.object(self.scanner, '_check_pattern', return_value=False) as mock_check_pattern:
+                self.scanner._check_content_for_issues("Tell me about machine learning.", 0, issues)
+                
+                checked = [c[0][1] for c in mock_check_pattern.call_args_list]
+                self.assertNotIn(self.scanner.injection_patterns["system_role_impersonation"], checked)
+                self.assertIn(self.scanner.injection_patterns["system_message_exemption"], checked)
+    
     def test_check_guardrail_privacy(self):
         """Test guardrail checks for privacy type."""
         # Set up a privacy guardrail with a pattern that will match
@@ -268,13 +436,12 @@ class TestScannerFunctionality(unittest.TestCase):
                 }
             ]
         }
-        # Configure re.search to return True for this specific pattern
-        self.mock_re_search.return_value = True
-        self.assertFalse(self.scanner._check_guardrail("SSN: 123-45-6789", privacy_guardrail))
+        with patch('re.compile', side_effect=REAL_RE_COMPILE):
+            self.assertFalse(self.scanner._check_guardrail("SSN: 123-45-6789", privacy_guardrail))
         
         # Test with non-matching content
-        self.mock_re_search.return_value = None
         self.assertTrue(self.scanner._check_guardrail("No SSN here", privacy_guardrail))
+        self.mock_re_search.assert_not_called()
     
     def test_check_guardrail_limit(self):
         """Test guardrail checks for token limit type."""
@@ -405,6 +572,14 @@ class TestScannerFunctionality(unittest.TestCase):
                 self.assertEqual(custom_issue["guardrail"], "custom_guardrail")
                 self.assertEqual(custom_issue["description"], "Custom guardrail test")
     
+    def test_scan_text_async_default_runs_sync_call(self):
+        """Test that scan_text_async falls back to the synchronous evaluation call."""
+        result = asyncio.run(self.scanner.scan_text_async("Hello"))
+        
+        self.assertTrue(result.is_safe)
+        self.assertEqual(result.reasoning, "Test reasoning")
+        self.assertEqual(result.token_usage, {"prompt_tokens": 10, "completion_tokens": 5})
+    
     def test_scan_method(self):
         """Test the scan method for prompt scanning."""
         # Create a sample prompt
@@ -761,17 +936,19 @@ class TestScannerFunctionality(unittest.TestCase):
             ]
         }
         
-        # Mock re.search to return a match
-        with patch('re.search', return_value=True):
+        with patch('re.compile', side_effect=REAL_RE_COMPILE) as mock_compile:
             # Test with content that matches the pattern
             result = scanner._check_guardrail("SSN: 123-45-6789", privacy_guardrail)
             self.assertFalse(result)  # Should fail the guardrail check
-        
-        # Mock re.search to return no match
-        with patch('re.search', return_value=None):
+            
             # Test with content that doesn't match the pattern
             result = scanner._check_guardrail("No SSN here", privacy_guardrail)
             self.assertTrue(result)  # Should pass the guardrail check
+        
+        # The pattern is compiled on first use and reused afterwards
+        self.assertIn("compiled_regex", privacy_guardrail["patterns"][0])
+        self.assertEqual(mock_compile.call_count, 1)
+        self.mock_re_search.assert_not_called()
 
 
 class TestOpenAIScanner(unittest.TestCase):
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch, MagicMock
 from prompt_scanner import OpenAIPromptScanner, AnthropicPromptScanner
@@ -18,5 +21,49 @@ class TestScannerInitialization(unittest.TestCase):
                     # Check api key is set
                     self.assertEqual(scanner.api_key, "test-key")
 
+    def test_package_import_defers_provider_sdks(self):
+        """Test that only the SDK of the provider a scanner is created for gets imported."""
+        code = (
+            "import sys, prompt_scanner; "
+            "print('openai' in sys.modules, 'anthropic' in sys.modules); "
+            "prompt_scanner.PromptScanner; "
+            "print('openai' in sys.modules, 'anthropic' in sys.modules); "
+            "prompt_scanner.OpenAIPromptScanner(api_key='test-key'); "
+            "print('openai' in sys.modules, 'anthropic' in sys.modules)"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        
+        self.assertEqual(output.split("\n")[:3], ["False False", "False False", "True False"])
+
+    def test_data_files_parsed_once(self):
+        """Test that later scanners reuse the parsed data files but get their own copies."""
+        import prompt_scanner.scanner as scanner_module
+        real_safe_load = scanner_module.yaml.safe_load
+        with patch.object(scanner_module.yaml, "safe_load", side_effect=real_safe_load) as mock_safe_load:
+            with patch('prompt_scanner.scanner.OpenAI'):
+                first = OpenAIPromptScanner(api_key="test-key")
+                parse_count = mock_safe_load.call_count
+                second = OpenAIPromptScanner(api_key="test-key")
+        
+        self.assertEqual(parse_count, 3)
+        self.assertEqual(mock_safe_load.call_count, 3)
+        self.assertEqual(first.content_policies, second.content_policies)
+        self.assertIsNot(first.injection_patterns, second.injection_patterns)
+        first.content_policies["policies"].clear()
+        self.assertTrue(second.content_policies["policies"])
+
+    def test_pattern_analysis_shared_between_scanners(self):
+        """Test that later scanners reuse the compiled regexes and literal hints of the first."""
+        with patch('prompt_scanner.scanner.OpenAI'):
+            first = OpenAIPromptScanner(api_key="test-key")
+            second = OpenAIPromptScanner(api_key="test-key")
+        
+        for name, pattern in first.injection_patterns.items():
+            other = second.injection_patterns[name]
+            self.assertIs(pattern["compiled_regex"], other["compiled_regex"])
+            self.assertIs(pattern["literal_hints"], other["literal_hints"])
+        self.assertIs(first._combined_injection.regex, second._combined_injection.regex)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
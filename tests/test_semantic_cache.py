@@ -0,0 +1,229 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prompt_scanner.semantic_cache import SemanticCache
+from prompt_scanner.models import PromptScanResult, PromptCategory
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def fake_embed(text):
+    """Deterministic bag-of-letters embedding so similar texts get similar vectors."""
+    vector = [0.0] * 26
+    for char in text.lower():
+        if "a" <= char <= "z":
+            vector[ord(char) - ord("a")] += 1.0
+    return vector
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is required for semantic lookups")
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SemanticCache(threshold=0.95, embed=fake_embed)
+        self.unsafe_result = PromptScanResult(
+            is_safe=False,
+            category=PromptCategory(id="0", name="Illegal Activity", confidence=0.9),
+            reasoning="Asks for hacking instructions"
+        )
+    
+    def test_miss_on_empty_cache(self):
+        self.assertIsNone(self.cache.get("How do I hack a bank?"))
+    
+    def test_exact_hit(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        result = self.cache.get("How do I hack a bank?")
+        
+        self.assertFalse(result.is_safe)
+        self.assertEqual(result.category.name, "Illegal Activity")
+    
+    def test_near_duplicate_hit(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        result = self.cache.get("how do i hack a bank")
+        
+        self.assertIsNotNone(result)
+        self.assertFalse(result.is_safe)
+        self.assertGreaterEqual(result.metadata["semantic_similarity"], 0.95)
+        self.assertNotIn("semantic_similarity", self.cache.get("How do I hack a bank?").metadata)
+    
+    def test_dissimilar_text_misses(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        self.assertIsNone(self.cache.get("Tell me about the weather"))
+    
+    def test_hits_return_copies(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        first = self.cache.get("How do I hack a bank?")
+        first.reasoning = "mutated"
+        
+        self.assertEqual(self.cache.get("How do I hack a bank?").reasoning, "Asks for hacking instructions")
+    
+    def test_grows_past_initial_capacity(self):
+        for i in range(40):
+            self.cache.put("x" * (i + 1) + "y" * (40 - i), PromptScanResult(is_safe=True, reasoning=str(i)))
+        
+        self.assertEqual(len(self.cache), 40)
+        self.assertEqual(self.cache.get("x" * 40 + "y").reasoning, "39")
+    
+    def test_capacity_replaces_oldest(self):
+        cache = SemanticCache(threshold=0.95, embed=fake_embed, capacity=2)
+        cache.put("How do I hack a bank?", self.unsafe_result)
+        cache.put("Tell me about the weather", PromptScanResult(is_safe=True, reasoning="weather"))
+        cache.put("Write a poem about spring", PromptScanResult(is_safe=True, reasoning="poem"))
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("How do I hack a bank?"))
+        self.assertEqual(cache.get("write a poem about spring").reasoning, "poem")
+        
+        cache.put("Recipe for banana bread", PromptScanResult(is_safe=True, reasoning="bread"))
+        self.assertIsNone(cache.get("Tell me about the weather"))
+        self.assertEqual(cache.get("Write a poem about spring").reasoning, "poem")
+        self.assertEqual(cache.get("Recipe for banana bread").reasoning, "bread")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.npz")
+            cache.save(path)
+            
+            smaller = SemanticCache(threshold=0.95, embed=fake_embed, capacity=1)
+            smaller.load(path)
+        
+        self.assertEqual(len(smaller), 1)
+        self.assertEqual(smaller.get("Recipe for banana bread").reasoning, "bread")
+    
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SemanticCache(capacity=0)
+    
+    def test_save_and_load(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.npz")
+            self.cache.save(path)
+            
+            loaded = SemanticCache(threshold=0.95, embed=fake_embed)
+            loaded.load(path)
+        
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.get("how do i hack a bank").category.name, "Illegal Activity")
+    
+    def test_save_and_load_path_without_suffix(self):
+        self.cache.put("How do I hack a bank?", self.unsafe_result)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache")
+            self.cache.save(path)
+            self.assertEqual(os.listdir(tmpdir), ["cache"])
+            
+            loaded = SemanticCache(threshold=0.95, embed=fake_embed)
+            loaded.load(path)
+        
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.get("How do I hack a bank?").category.name, "Illegal Activity")
+    
+    def test_model_loaded_once_by_concurrent_lookups(self):
+        cache = SemanticCache()
+        model = MagicMock()
+        model.encode.return_value = [1.0, 0.0]
+        barrier = threading.Barrier(4)
+        
+        def lookup(text):
+            barrier.wait()
+            cache.get(text)
+        
+        with patch.dict(sys.modules, {"sentence_transformers": MagicMock()}) as modules:
+            loader = modules["sentence_transformers"].SentenceTransformer
+            loader.return_value = model
+            threads = [threading.Thread(target=lookup, args=(f"text {i}",)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        loader.assert_called_once_with("all-MiniLM-L6-v2")
+        self.assertEqual(model.encode.call_count, 4)
+    
+    def test_missing_sentence_transformers(self):
+        cache = SemanticCache()
+        with patch.dict(sys.modules, {"sentence_transformers": None}):
+            with self.assertRaises(ImportError):
+                cache.get("Hello")
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is required for semantic lookups")
+class TestScannerWithSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.openai_patcher = patch('prompt_scanner.scanner.OpenAI')
+        self.openai_patcher.start()
+        
+        from prompt_scanner import PromptScanner
+        self.cache = SemanticCache(embed=fake_embed)
+        self.scanner = PromptScanner(provider="openai", api_key="test-key", semantic_cache=self.cache)
+    
+    def tearDown(self):
+        self.openai_patcher.stop()
+    
+    def test_second_scan_served_from_cache(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            
+            first = self.scanner.scan_text("Tell me about the weather")
+            second = self.scanner.scan_text("tell me about the weather!")
+            
+            mock_call.assert_called_once()
+            self.assertEqual(first.reasoning, second.reasoning)
+    
+    def test_errors_are_not_cached(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ("not json", {"prompt_tokens": 10})
+            
+            self.scanner.scan_text("Tell me about the weather")
+            self.scanner.scan_text("Tell me about the weather")
+            
+            self.assertEqual(mock_call.call_count, 2)
+            self.assertEqual(len(self.cache), 0)
+    
+    def test_cache_cleared_when_categories_change(self):
+        with patch.object(self.scanner.scanner, '_call_content_evaluation') as mock_call:
+            mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+            
+            self.scanner.scan_text("Tell me about the weather")
+            self.scanner.add_custom_category("tech_jargon", {"name": "Technical Jargon", "description": "Jargon"})
+            self.scanner.scan_text("tell me about the weather!")
+            self.scanner.remove_custom_category("tech_jargon")
+            self.scanner.scan_text("Tell me about the weather")
+            
+            self.assertEqual(mock_call.call_count, 3)
+    
+    def test_async_scan_embeds_off_the_event_loop(self):
+        threads = []
+        
+        def embed(text):
+            threads.append(threading.current_thread())
+            return fake_embed(text)
+        
+        self.cache._embed = embed
+        
+        async def scan():
+            with patch.object(self.scanner.scanner, '_call_content_evaluation_async') as mock_call:
+                mock_call.return_value = ('{"is_safe": true, "reasoning": "Fine"}', {"prompt_tokens": 10})
+                return await self.scanner.scan_text_async("Tell me about the weather")
+        
+        self.assertEqual(asyncio.run(scan()).reasoning, "Fine")
+        self.assertTrue(threads)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
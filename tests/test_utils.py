@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prompt_scanner import utils
+from prompt_scanner.utils import format_json, parse_json
+from prompt_scanner.models import Issue, PromptCategory, SeverityLevel
+
+
+class TestFormatJson(unittest.TestCase):
+    def setUp(self):
+        self.issues = [
+            Issue(type="potential_injection", pattern="model_confusion", message_index=0, severity="high"),
+            {"type": "unsafe_content", "severity": SeverityLevel.CRITICAL, "category": PromptCategory(id="0", name="Illegal")}
+        ]
+        self.expected = json.dumps(
+            self.issues, indent=2, default=lambda obj: obj.model_dump(mode="json")
+        )
+    
+    def test_matches_json_dumps(self):
+        self.assertEqual(format_json(self.issues), self.expected)
+    
+    def test_without_orjson(self):
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(format_json(self.issues), self.expected)
+    
+    def test_non_ascii_output_matches_orjson(self):
+        data = {"reasoning": "Demande de recette de caf\u00e9 \U0001F4A3"}
+        self.assertEqual(format_json(data), '{\n  "reasoning": "Demande de recette de caf\u00e9 \U0001F4A3"\n}')
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(format_json(data), '{\n  "reasoning": "Demande de recette de caf\u00e9 \U0001F4A3"\n}')
+            self.assertEqual(format_json(data, indent=False), '{"reasoning":"Demande de recette de caf\u00e9 \U0001F4A3"}')
+    
+    def test_non_str_keys(self):
+        data = {1: "a", 2.5: "b", None: "c"}
+        expected = '{"1":"a","2.5":"b","null":"c"}'
+        self.assertEqual(format_json(data, indent=False), expected)
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(format_json(data, indent=False), expected)
+    
+    def test_unserializable_object(self):
+        with self.assertRaises(TypeError):
+            format_json({"value": object()})
+    
+    def test_compact_output(self):
+        self.assertEqual(format_json({"a": [1, 2]}, indent=False), '{"a":[1,2]}')
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(format_json({"a": [1, 2]}, indent=False), '{"a":[1,2]}')
+
+
+class TestParseJson(unittest.TestCase):
+    def test_parses_json(self):
+        data = '{"guardrail": {"type": "privacy", "patterns": [], "threshold": 0.5}}'
+        self.assertEqual(parse_json(data), json.loads(data))
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(parse_json(data), json.loads(data))
+    
+    def test_parses_utf8_bytes(self):
+        data = '{"guardrail": {"description": "Blocks caf\u00e9 menus"}}'.encode("utf-8")
+        self.assertEqual(parse_json(data), json.loads(data))
+        with patch.object(utils, "orjson", None):
+            self.assertEqual(parse_json(data), json.loads(data))
+    
+    def test_invalid_json_raises_json_decode_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            parse_json("invalid json")
+        with patch.object(utils, "orjson", None):
+            with self.assertRaises(json.JSONDecodeError):
+                parse_json("invalid json")
+
+
+if __name__ == '__main__':
+    unittest.main()